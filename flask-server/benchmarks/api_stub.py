@@ -0,0 +1,238 @@
+# api_stub.py
+
+# Local stand-in for the SFU course outlines API, for measuring the crawler
+# under controlled load on one machine. Serves synthetic terms (see
+# synthetic.py) on the same /bin/wcm/course-outlines?{term}/{dept}/{course}/{section}
+# hierarchy, with configurable latency, slow responses, 5xx errors, rate
+# limiting (429) and 404s for missing listings.
+#
+# Run from flask-server/ :
+#     python -m benchmarks.api_stub --port 8900 --latency-ms 20 --error-rate 0.01
+# then point the crawler at it :
+#     SFUCoursesAPI("2025/spring", api_url="http://127.0.0.1:8900/bin/wcm/course-outlines")
+#
+# GET /__stats returns request counts by status.
+
+import argparse, hashlib, json, random, threading, time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from benchmarks.synthetic import generate_term
+
+API_PATH = "/bin/wcm/course-outlines"
+
+
+class StubConfig:
+    """
+    Args:
+        departments, courses, sections (int): Size of each synthetic term
+        seed (int): Seed for data generation and failure injection
+        latency_ms (float): Added to every response
+        jitter_ms (float): Random extra latency, uniform in [0, jitter_ms]
+        slow_rate (float): Fraction of responses delayed by slow_ms more
+        slow_ms (float): Extra delay of slow responses
+        error_rate (float): Fraction of responses replaced by a 503
+        rate_limit (float): Requests per second allowed before 429s (0 = off)
+        missing_rate (float): Fraction of department and course listings
+            that 404, like listings the live API does not have
+    """
+
+    def __init__(
+        self,
+        departments: int = 60,
+        courses: int = 25,
+        sections: int = 4,
+        seed: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_ms: float = 1000.0,
+        error_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        missing_rate: float = 0.0,
+    ):
+        self.departments = departments
+        self.courses = courses
+        self.sections = sections
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.missing_rate = missing_rate
+
+
+class TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple, config: StubConfig):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.terms = {}
+        self.terms_lock = threading.Lock()
+        self.bucket = TokenBucket(config.rate_limit) if config.rate_limit else None
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+        self.stats = Counter()
+
+    def responses_for(self, term: str) -> dict:
+        with self.terms_lock:
+            if term not in self.terms:
+                c = self.config
+                self.terms[term] = generate_term(
+                    term, c.departments, c.courses, c.sections, c.seed
+                )
+            return self.terms[term]
+
+    def random(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def is_missing(self, key: str) -> bool:
+        """
+        Deterministically drop a fraction of department and course
+        listings, so the same URLs 404 on every run.
+        """
+
+        if not self.config.missing_rate or key.count("/") not in (2, 3):
+            return False
+        digest = hashlib.sha256(f"{self.config.seed}:{key}".encode()).digest()
+        return digest[0] / 256 < self.config.missing_rate
+
+    def lookup(self, key: str):
+        """
+        Returns (<int (status)>, <json body>) for a lower case query key.
+        """
+
+        parts = key.split("/")
+        if len(parts) < 2:
+            return 404, []
+        body = self.responses_for("/".join(parts[:2])).get(key)
+        if body is None or self.is_missing(key):
+            return 404, []
+        return 200, body
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle's
+    # algorithm adds ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        config = server.config
+        url = urlsplit(self.path)
+
+        if url.path == "/__stats":
+            self.send_json(200, dict(server.stats))
+            return
+        if url.path != API_PATH:
+            self.send_json(404, [])
+            return
+
+        delay = config.latency_ms + server.random() * config.jitter_ms
+        if config.slow_rate and server.random() < config.slow_rate:
+            delay += config.slow_ms
+        if delay:
+            time.sleep(delay / 1000)
+
+        if server.bucket is not None and not server.bucket.take():
+            self.send_json(429, {"error": "Too Many Requests"}, {"Retry-After": "1"})
+        elif config.error_rate and server.random() < config.error_rate:
+            self.send_json(503, {"error": "Service Unavailable"})
+        else:
+            self.send_json(*server.lookup(url.query.lower()))
+
+    def send_json(self, status: int, body, headers: dict = None):
+        self.server.stats[status] += 1
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate the timings
+        pass
+
+
+def start_stub(
+    config: StubConfig, host: str = "127.0.0.1", port: int = 0
+) -> StubServer:
+    """
+    Start a stub server in a daemon thread; port 0 picks a free port.
+    Stop it with server.shutdown().
+
+    The API URL to crawl is f"http://{host}:{server.server_port}{API_PATH}".
+    """
+
+    server = StubServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SFU course outlines API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--departments", type=int, default=60)
+    parser.add_argument("--courses", type=int, default=25)
+    parser.add_argument("--sections", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=1000.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        departments=args.departments,
+        courses=args.courses,
+        sections=args.sections,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        missing_rate=args.missing_rate,
+    )
+    server = StubServer((args.host, args.port), config)
+    print(f"Serving http://{args.host}:{server.server_port}{API_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# fixture.py
+
+# Recorded SFU course outlines responses, replayed through a requests
+# transport adapter so crawls run offline and reproducibly, plus an
+# in-memory stand-in for the Supabase client.
+#
+# Record a term from the live API (run from flask-server/) :
+#     python -m benchmarks.fixture 2025/spring
+# which writes benchmarks/fixtures/2025-spring.json.gz
+
+import argparse, gzip, json, os
+from collections import Counter
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_path(term: str) -> str:
+    return os.path.join(FIXTURE_DIR, term.replace("/", "-") + ".json.gz")
+
+
+def query_key(url: str) -> str:
+    """
+    Fixture key of a course outlines URL: its lower case query,
+    e.g. ".../course-outlines?2025/spring/CMPT/225" -> "2025/spring/cmpt/225"
+    """
+
+    return urlsplit(url).query.lower()
+
+
+def load_fixture(path: str) -> dict:
+    """
+    Returns the recorded responses in form :
+    { <string (query key)> : {"status": <int>, "body": <json>} }
+    """
+
+    with gzip.open(path, "rt") as f:
+        return json.load(f)
+
+
+def save_fixture(responses: dict, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, "wt") as f:
+        json.dump(responses, f)
+
+
+def fixture_from_bodies(bodies: dict) -> dict:
+    """
+    Wrap plain response bodies (e.g. from synthetic.generate_term) as
+    200 responses.
+    """
+
+    return {key: {"status": 200, "body": body} for key, body in bodies.items()}
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Serves recorded responses; unknown URLs get a 404, like the live API.
+
+    Mount it on a session, e.g. api.session.mount("http://", ReplayAdapter(f))
+    """
+
+    def __init__(self, responses: dict):
+        super().__init__()
+        self.responses = responses
+        self.request_count = 0
+
+    def send(self, request, **kwargs):
+        self.request_count += 1
+        recorded = self.responses.get(query_key(request.url))
+
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.headers["Content-Type"] = "application/json"
+        if recorded is None:
+            response.status_code = 404
+            response._content = b"[]"
+        else:
+            response.status_code = recorded["status"]
+            response._content = json.dumps(recorded["body"]).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Passes requests through to the network and keeps every JSON response.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.responses = {}
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        self.responses[query_key(request.url)] = {
+            "status": response.status_code,
+            "body": body,
+        }
+        return response
+
+
+def mount(session, adapter):
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+class FakeResult:
+    def __init__(self, data: list):
+        self.data = data
+
+
+class FakeQuery:
+    """
+    Just enough of the supabase-py query builder for SupabaseInserter.
+    """
+
+    def __init__(self, client: "FakeSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.op = "select"
+        self.rows = None
+        self.filters = []
+
+    def select(self, columns: str):
+        return self
+
+    def eq(self, column: str, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column: str, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def insert(self, rows):
+        self.op = "insert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows):
+        self.op = "upsert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def execute(self) -> FakeResult:
+        client = self.client
+        client.requests[self.op] += 1
+        table = client.tables.setdefault(self.table, [])
+
+        if self.op == "insert":
+            for row in self.rows:
+                client.next_id += 1
+                table.append(dict(row, id=client.next_id))
+            client.rows_written[self.table] += len(self.rows)
+            return FakeResult(self.rows)
+
+        if self.op == "upsert":
+            by_id = {row["id"]: i for i, row in enumerate(table) if "id" in row}
+            for row in self.rows:
+                if row.get("id") in by_id:
+                    table[by_id[row["id"]]] = dict(row)
+                else:
+                    client.next_id += 1
+                    table.append(dict(row, id=row.get("id", client.next_id)))
+            client.rows_written[self.table] += len(self.rows)
+            return FakeResult(self.rows)
+
+        matched = [row for row in table if all(f(row) for f in self.filters)]
+        if self.op == "delete":
+            matched_ids = {row["id"] for row in matched}
+            client.tables[self.table] = [
+                row for row in table if row["id"] not in matched_ids
+            ]
+            client.rows_written[self.table] += len(matched)
+        return FakeResult(matched)
+
+
+class FakeSupabase:
+    """
+    In-memory Supabase client that counts requests and rows written.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.next_id = 0
+        self.requests = Counter()
+        self.rows_written = Counter()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+
+def main():
+    from controllers.sfu_api import SFUCoursesAPI
+    from controllers.term_store import TermCatalog
+
+    parser = argparse.ArgumentParser(description="Record a term fixture")
+    parser.add_argument(
+        "term", help='Term in form <year>/<semester>, e.g. "2025/spring"'
+    )
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    api = SFUCoursesAPI(args.term)
+    adapter = RecordingAdapter()
+    mount(api.session, adapter)
+    api.crawl_term(TermCatalog())
+
+    path = args.output or fixture_path(args.term)
+    save_fixture(adapter.responses, path)
+    print(f"Recorded {len(adapter.responses)} responses to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# load_test.py
+
+# Local load-test harness for the course endpoints, including the bundle and
+# the free time search used to build schedules. POST /schedules/generate is
+# left out: it is a 501 stub until schedule generation lands.
+# Start the server first (e.g. gunicorn -c gunicorn.conf.py), then run from
+# flask-server/ :
+#     python -m benchmarks.load_test --term 2025/spring --dept CMPT --course 225
+#
+# Prints one JSON object per endpoint with requests per second and
+# p50 / p99 latency in milliseconds. "ok" is false when any response was an
+# error, in which case the numbers measure the error path.
+
+import argparse, http.client, json, threading, time
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+def run_endpoint(args, method: str, path: str, body: bytes = None) -> dict:
+    """
+    Hit one endpoint with args.concurrency keep-alive connections until
+    args.requests requests have completed.
+    """
+
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    remaining = [args.requests]
+    headers = {"Accept-Encoding": args.accept_encoding}
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+
+    def worker():
+        conn = http.client.HTTPConnection(args.host, args.port, timeout=30)
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+
+            start = time.perf_counter()
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "endpoint": f"{method} {path}",
+        "requests": len(latencies),
+        "rps": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "statuses": statuses,
+        "ok": all(200 <= status < 400 for status in statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Flask server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--accept-encoding", default="gzip, br")
+    parser.add_argument("--term", default="2025/spring")
+    parser.add_argument("--dept", default="CMPT")
+    parser.add_argument("--course", default="225")
+    args = parser.parse_args()
+
+    # A typical timetable: a Monday/Wednesday/Friday morning class
+    free_time = {
+        "busy": [{"days": "Mo, We, Fr", "start": "10:30", "end": "11:20"}],
+        "limit": 50,
+    }
+    endpoints = [
+        ("GET", f"/courses/{args.term}", None),
+        ("GET", f"/courses/{args.term}/{args.dept}", None),
+        ("GET", f"/courses/{args.term}/{args.dept}/{args.course}", None),
+        ("GET", f"/courses/{args.term}/bundle", None),
+        (
+            "POST",
+            f"/courses/{args.term}/free-time",
+            json.dumps(free_time).encode(),
+        ),
+    ]
+
+    for method, path, body in endpoints:
+        print(json.dumps(run_endpoint(args, method, path, body)))
+
+
+if __name__ == "__main__":
+    main()
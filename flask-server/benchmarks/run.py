@@ -0,0 +1,291 @@
+# run.py
+
+# Offline benchmark suite. Everything runs against a recorded course outlines
+# fixture (see fixture.py), or a deterministic synthetic term when none is
+# recorded, so results are comparable between commits.
+#
+# Run from flask-server/ :
+#     python -m benchmarks.run --output results.json
+#     python -m benchmarks.run --compare base.json results.json --threshold 0.15
+#     python -m benchmarks.run --stub --stub-latency-ms 5 --stub-error-rate 0.01
+
+import argparse, contextlib, io, json, os, platform, statistics, subprocess, sys, time
+
+from benchmarks.fixture import (
+    FakeSupabase,
+    ReplayAdapter,
+    fixture_from_bodies,
+    fixture_path,
+    load_fixture,
+    mount,
+)
+from benchmarks.synthetic import generate_term
+
+
+def metric(value: float, better: str) -> dict:
+    """
+    better is "higher" or "lower"; --compare uses it to spot regressions.
+    """
+
+    return {"value": value, "better": better}
+
+
+def timed(func, repeats: int) -> tuple:
+    """
+    Run func repeats times with stdout silenced (the controllers print
+    progress), returning (<median seconds>, <last result>).
+    """
+
+    durations = []
+    result = None
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+def replay_api(term: str, responses: dict):
+    from controllers.sfu_api import SFUCoursesAPI
+
+    api = SFUCoursesAPI(term)
+    adapter = ReplayAdapter(responses)
+    mount(api.session, adapter)
+    return api, adapter
+
+
+def bench_crawl(term: str, responses: dict, repeats: int) -> dict:
+    from controllers.term_store import TermCatalog
+
+    def crawl():
+        api, adapter = replay_api(term, responses)
+        catalog = TermCatalog()
+        api.crawl_term(catalog)
+        sections = sum(1 for _ in catalog.get_term(term).iter_sections())
+        return adapter.request_count, sections
+
+    seconds, (request_count, sections) = timed(crawl, repeats)
+    return {
+        "seconds": metric(seconds, "lower"),
+        "requests": metric(request_count, "lower"),
+        "requests_per_second": metric(request_count / seconds, "higher"),
+        "sections_per_second": metric(sections / seconds, "higher"),
+    }
+
+
+def bench_crawl_stub(args) -> dict:
+    """
+    Crawl over real HTTP against the local API stand-in (api_stub.py),
+    with its injected latency and failures.
+    """
+
+    from benchmarks.api_stub import API_PATH, StubConfig, start_stub
+    from controllers.sfu_api import SFUCoursesAPI
+    from controllers.term_store import TermCatalog
+
+    server = start_stub(
+        StubConfig(
+            departments=args.departments,
+            courses=args.courses,
+            sections=args.sections,
+            latency_ms=args.stub_latency_ms,
+            error_rate=args.stub_error_rate,
+        )
+    )
+    try:
+        api = SFUCoursesAPI(
+            args.term, api_url=f"http://127.0.0.1:{server.server_port}{API_PATH}"
+        )
+        catalog = TermCatalog()
+        seconds, _ = timed(lambda: api.crawl_term(catalog), 1)
+        sections = sum(1 for _ in catalog.get_term(args.term).iter_sections())
+    finally:
+        server.shutdown()
+
+    expected = args.departments * args.courses * args.sections
+    return {
+        "seconds": metric(seconds, "lower"),
+        "requests_per_second": metric(api.request_count / seconds, "higher"),
+        "sections_loaded_ratio": metric(sections / expected, "higher"),
+        "server_errors": metric(server.stats[503], "lower"),
+    }
+
+
+def bench_sync(term: str, responses: dict, repeats: int) -> dict:
+    from controllers.db_updater import SupabaseInserter
+
+    api, _ = replay_api(term, responses)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sfu_data = api.get_course_outlines()
+
+    def sync(client: FakeSupabase):
+        api, _ = replay_api(term, responses)
+        SupabaseInserter(client, sfu_data, term, api=api).fetch_and_sync_all()
+        return client
+
+    # Initial sync into an empty database
+    seconds, client = timed(lambda: sync(FakeSupabase()), repeats)
+    results = {
+        "initial_seconds": metric(seconds, "lower"),
+        "initial_requests": metric(sum(client.requests.values()), "lower"),
+        "initial_rows_written": metric(sum(client.rows_written.values()), "lower"),
+    }
+
+    # Resync with nothing changed should write nothing
+    client.requests.clear()
+    client.rows_written.clear()
+    seconds, _ = timed(lambda: sync(client), 1)
+    results.update(
+        {
+            "resync_seconds": metric(seconds, "lower"),
+            "resync_requests": metric(sum(client.requests.values()), "lower"),
+            "resync_rows_written": metric(sum(client.rows_written.values()), "lower"),
+        }
+    )
+    return results
+
+
+TRANSCRIPT_LINES = (
+    "CMPT 225 Data Structures and Programming 3.00 3.00 A 12.00 B+ 180",
+    "MATH 151 Calculus I 3.00 3.00 B+ 9.99 B 250",
+    "ENGL 199 Writing to Persuade 3.00 3.00 A- 11.01 B 40",
+    "CMPT 276 Intro Software Engineering 3.00 0.00 0.00 - 120",
+)
+
+
+def bench_transcript(repeats: int) -> dict:
+    from controllers.transcript_controller import parse_course_data
+
+    lines = list(TRANSCRIPT_LINES) * 10
+
+    def parse():
+        for _ in range(100):
+            parse_course_data(lines)
+        return len(lines) * 100
+
+    seconds, parsed = timed(parse, repeats)
+    return {
+        "lines_per_second": metric(parsed / seconds, "higher"),
+    }
+
+
+def bench_schedule() -> dict:
+    # controllers/scheduler_controller.py has no scheduling algorithm yet;
+    # report it as skipped so results stay comparable once it lands.
+    return {"skipped": "scheduler_controller has no schedule generation yet"}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args) -> dict:
+    path = args.fixture or fixture_path(args.term)
+    if os.path.exists(path):
+        responses = load_fixture(path)
+        source = os.path.basename(path)
+    else:
+        responses = fixture_from_bodies(
+            generate_term(
+                args.term,
+                departments=args.departments,
+                courses=args.courses,
+                sections=args.sections,
+            )
+        )
+        source = f"synthetic:{args.departments}x{args.courses}x{args.sections}"
+
+    results = {
+        "crawl": bench_crawl(args.term, responses, args.repeats),
+        "sync": bench_sync(args.term, responses, args.repeats),
+        "transcript": bench_transcript(args.repeats),
+        "schedule": bench_schedule(),
+    }
+    if args.stub:
+        results["crawl_stub"] = bench_crawl_stub(args)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "fixture": source,
+        "results": results,
+    }
+
+
+def compare(base: dict, head: dict, threshold: float) -> list:
+    """
+    Metrics that got worse by more than threshold (a fraction) from
+    base to head, as readable strings.
+    """
+
+    regressions = []
+    for bench, metrics in head["results"].items():
+        for name, current in metrics.items():
+            previous = base["results"].get(bench, {}).get(name)
+            if not isinstance(current, dict) or not isinstance(previous, dict):
+                continue
+            old, new = previous["value"], current["value"]
+            if old == 0:
+                worse = new > 0 if current["better"] == "lower" else False
+            elif current["better"] == "lower":
+                worse = (new - old) / old > threshold
+            else:
+                worse = (old - new) / old > threshold
+            if worse:
+                regressions.append(f"{bench}.{name}: {old:.4g} -> {new:.4g}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("--term", default="2025/spring")
+    parser.add_argument("--fixture", default=None, help="Recorded fixture path")
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--sections", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "HEAD"),
+        help="Compare two results files instead of running",
+    )
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument(
+        "--stub", action="store_true", help="Also crawl the local API stand-in"
+    )
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            head = json.load(f)
+        regressions = compare(base, head, args.threshold)
+        for regression in regressions:
+            print(f"[bench] REGRESSION {regression}")
+        return 1 if regressions else 0
+
+    results = run_suite(args)
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# startup.py
+
+# Cold-start guard for the Flask app factory.
+# Spawns fresh interpreters that import server and call create_app(), then
+# checks wall time, peak RSS and that no heavy dependency was imported.
+#
+# Run from flask-server/ :
+#     python -m benchmarks.startup --runs 5 --max-seconds 0.5 --max-rss-mb 60
+
+import argparse, json, os, subprocess, sys
+
+# Dependencies that must only be imported on first use
+LAZY_MODULES = ("pdfplumber", "supabase", "dotenv")
+
+CHILD_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+from server import create_app
+create_app()
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss_kb //= 1024
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": rss_kb / 1024,
+    "eager_modules": [m for m in %r if m in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def measure_once(cwd: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold-start guard for create_app()")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=0.5)
+    parser.add_argument("--max-rss-mb", type=float, default=60.0)
+    args = parser.parse_args()
+
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = [measure_once(cwd) for _ in range(args.runs)]
+
+    # The first run pays for .pyc compilation, so report the median
+    seconds = sorted(r["seconds"] for r in runs)[len(runs) // 2]
+    rss_mb = max(r["rss_mb"] for r in runs)
+    eager = sorted({m for r in runs for m in r["eager_modules"]})
+
+    print(
+        json.dumps(
+            {"runs": args.runs, "seconds": seconds, "rss_mb": rss_mb, "eager": eager}
+        )
+    )
+
+    failures = []
+    if seconds > args.max_seconds:
+        failures.append(f"cold start {seconds:.3f}s > {args.max_seconds}s")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"peak RSS {rss_mb:.1f}MB > {args.max_rss_mb}MB")
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"[startup] FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# synthetic.py
+
+# Deterministic synthetic term in the shape of the SFU course outlines API.
+# Used when no recorded fixture is available, and by the local API stand-in.
+
+import random
+
+SEMESTER_TITLES = ("Introduction to", "Topics in", "Foundations of", "Advanced")
+SUBJECTS = (
+    "Computing",
+    "Data Structures",
+    "Algorithms",
+    "Calculus",
+    "Linear Algebra",
+    "Statistics",
+    "Writing",
+    "Economics",
+    "Psychology",
+    "Biology",
+)
+CAMPUSES = ("Burnaby", "Surrey", "Vancouver")
+DAY_PATTERNS = ("Mo, We, Fr", "Tu, Th", "Mo, We", "We", "Fr", "Tu")
+START_TIMES = ("08:30", "09:30", "10:30", "11:30", "12:30", "13:30", "14:30", "16:30")
+LAST_NAMES = ("Chen", "Singh", "Nguyen", "Smith", "Kim", "Garcia", "Brown", "Wong")
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Jamie", "Riley")
+
+
+def department_codes(count: int) -> list:
+    """
+    count distinct upper case department codes, e.g. ["AAA", "AAB", ...]
+    """
+
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return [
+        letters[i // 676 % 26] + letters[i // 26 % 26] + letters[i % 26]
+        for i in range(count)
+    ]
+
+
+def end_time(start: str, minutes: int) -> str:
+    hours, mins = map(int, start.split(":"))
+    total = hours * 60 + mins + minutes
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def generate_term(
+    term: str = "2025/spring",
+    departments: int = 60,
+    courses: int = 25,
+    sections: int = 4,
+    seed: int = 0,
+) -> dict:
+    """
+    Generate every course outlines response for a term.
+
+    Returns a dict keyed by the lower case query after "?" in form :
+    {
+        "<term>": [<dict (department)>],
+        "<term>/<dept>": [<dict (course)>],
+        "<term>/<dept>/<course>": [<dict (section)>],
+        "<term>/<dept>/<course>/<section>": <dict (section info)>
+    }
+    """
+
+    rng = random.Random(seed)
+    term = term.lower()
+    responses = {}
+    dept_codes = department_codes(departments)
+    responses[term] = [{"text": d, "value": d.lower()} for d in dept_codes]
+
+    for dept in dept_codes:
+        dept_key = f"{term}/{dept.lower()}"
+        numbers = sorted(rng.sample(range(100, 500), courses))
+        course_list = []
+
+        for number in numbers:
+            course_text = f"{number}W" if rng.random() < 0.1 else str(number)
+            title = f"{rng.choice(SEMESTER_TITLES)} {rng.choice(SUBJECTS)}"
+            course_list.append(
+                {"text": course_text, "value": course_text.lower(), "title": title}
+            )
+
+            section_list = []
+            units = rng.choice(("3", "3", "3", "4", "2"))
+            for s in range(sections):
+                is_lecture = s == 0
+                code = f"D{100 + s * 100}" if is_lecture else f"D{100 + s}"
+                section_code = "LEC" if is_lecture else rng.choice(("TUT", "LAB"))
+                section = {
+                    "text": code,
+                    "value": code.lower(),
+                    "title": title,
+                    "classType": "e",
+                    "sectionCode": section_code,
+                    "associatedClass": "1",
+                }
+                section_list.append(section)
+
+                start = rng.choice(START_TIMES)
+                length = 50 if section_code != "LAB" else 110
+                capacity = rng.choice((30, 60, 120, 250))
+                responses[f"{dept_key}/{course_text.lower()}/{code.lower()}"] = {
+                    "title": title,
+                    "units": units,
+                    "classNumber": str(rng.randint(1000, 9999)),
+                    "prerequisites": f"{dept} {numbers[0]}." if number > 200 else "",
+                    "corequisites": "",
+                    "designation": rng.choice(("", "Quantitative", "Writing")),
+                    "shortNote": "",
+                    "deliveryMethod": "In Person",
+                    "associatedClass": "1",
+                    "enrollmentCapacity": str(capacity),
+                    "enrollmentTotal": str(rng.randint(0, capacity)),
+                    "instructor": [
+                        {
+                            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                            "roleCode": "PI",
+                        }
+                    ],
+                    "meetingTimes": [
+                        {
+                            "days": rng.choice(DAY_PATTERNS),
+                            "startTime": start,
+                            "endTime": end_time(start, length),
+                            "location": f"AQ {rng.randint(2000, 5000)}",
+                            "campus": rng.choice(CAMPUSES),
+                            "scheduleType": section_code,
+                        }
+                    ],
+                }
+
+            responses[f"{dept_key}/{course_text.lower()}"] = section_list
+        responses[dept_key] = course_list
+
+    return responses
@@ -0,0 +1,193 @@
+# crawl_filter.py
+
+# Declarative rules for pruning the SFU course outlines crawl.
+# Rules are compiled once and checked before child requests are issued,
+# so excluded departments and courses are never fetched.
+
+import re
+from collections import Counter
+
+# Departments with no undergraduate offerings we schedule for
+DEFAULT_EXCLUDED_DEPARTMENTS = {
+    "GERO",
+    "LBST",
+    "PLAN",
+    "ALS",
+    "APMA",
+    "ARAB",
+    "CENV",
+    "DMED",
+    "EDPR",
+    "FAL",
+    "FAN",
+    "FASS",
+    "GERM",
+    "GRAD",
+    "GRK",
+    "INS",
+    "ITAL",
+    "LBRL",
+    "LS",
+    "NEUR",
+    "NUSC",
+    "ONC",
+    "PERS",
+    "PLCY",
+    "PORT",
+    "SD",
+    "SDA",
+    "SPAN",
+    "TEKX",
+    "UGRAD",
+    "URB",
+    "WS",
+    "WKTM",
+    "WDA",
+}
+
+DEFAULT_EXCLUDED_TITLE_KEYWORDS = ("Practicum", "Research Project")
+
+# First run of digits in a course number, e.g. "105W" -> 105, "XX1" -> 1
+COURSE_LEVEL_PATTERN = re.compile(r"\d+")
+
+
+class CrawlFilter:
+    """
+    Filter applied at each level of the crawl tree.
+
+    Args:
+        allow_departments (iterable): Only crawl these departments (None = all)
+        deny_departments (iterable): Never crawl these departments
+        min_level (int): Lowest course number to keep
+        max_level (int): Highest course number to keep
+        exclude_title_keywords (iterable): Skip courses whose title contains any
+        allow_components (iterable): Only keep sections of these types,
+            e.g. {"LEC", "TUT"} (None = all)
+
+    Counts of kept and excluded nodes are tallied in self.counts.
+    """
+
+    def __init__(
+        self,
+        allow_departments=None,
+        deny_departments=(),
+        min_level: int = 0,
+        max_level: int = None,
+        exclude_title_keywords=(),
+        allow_components=None,
+    ):
+        self.allow_departments = (
+            None
+            if allow_departments is None
+            else frozenset(d.upper() for d in allow_departments)
+        )
+        self.deny_departments = frozenset(d.upper() for d in deny_departments)
+        self.min_level = min_level
+        self.max_level = max_level
+        self.title_pattern = (
+            re.compile(
+                "|".join(re.escape(k) for k in exclude_title_keywords), re.IGNORECASE
+            )
+            if exclude_title_keywords
+            else None
+        )
+        self.allow_components = (
+            None
+            if allow_components is None
+            else frozenset(c.upper() for c in allow_components)
+        )
+        self.counts = Counter()
+
+    @classmethod
+    def default(cls):
+        """
+        Rules the crawler has always applied: undergraduate courses
+        (500 and below) outside the excluded departments, without
+        practicums or research projects.
+        """
+
+        return cls(
+            deny_departments=DEFAULT_EXCLUDED_DEPARTMENTS,
+            max_level=500,
+            exclude_title_keywords=DEFAULT_EXCLUDED_TITLE_KEYWORDS,
+        )
+
+    @classmethod
+    def from_dict(cls, config: dict):
+        """
+        Build a filter from a plain config dict, e.g. loaded from JSON :
+        {
+            "allow_departments": [<string>, ...],
+            "deny_departments": [<string>, ...],
+            "min_level": <int>,
+            "max_level": <int>,
+            "exclude_title_keywords": [<string>, ...],
+            "allow_components": [<string>, ...]
+        }
+        """
+
+        return cls(
+            allow_departments=config.get("allow_departments"),
+            deny_departments=config.get("deny_departments", ()),
+            min_level=config.get("min_level", 0),
+            max_level=config.get("max_level"),
+            exclude_title_keywords=config.get("exclude_title_keywords", ()),
+            allow_components=config.get("allow_components"),
+        )
+
+    def reset(self):
+        self.counts.clear()
+
+    def keep_department(self, department: str) -> bool:
+        code = department.upper()
+        keep = code not in self.deny_departments and (
+            self.allow_departments is None or code in self.allow_departments
+        )
+        self.counts["departments_kept" if keep else "departments_excluded"] += 1
+        return keep
+
+    def keep_course(self, course: dict) -> bool:
+        """
+        course is a course listing entry, e.g. {"text": "105W", "title": ...}
+        """
+
+        keep = True
+        match = COURSE_LEVEL_PATTERN.search(course["text"])
+        if match is not None:
+            level = int(match.group())
+            if level < self.min_level or (
+                self.max_level is not None and level > self.max_level
+            ):
+                keep = False
+
+        if keep and self.title_pattern is not None and "title" in course:
+            if self.title_pattern.search(course["title"]):
+                keep = False
+
+        self.counts["courses_kept" if keep else "courses_excluded"] += 1
+        return keep
+
+    def keep_section(self, section: dict) -> bool:
+        """
+        section is a section listing entry, e.g. {"text": "D100", "sectionCode": "LEC", ...}
+        """
+
+        keep = (
+            self.allow_components is None
+            or (section.get("sectionCode") or "").upper() in self.allow_components
+        )
+        self.counts["sections_kept" if keep else "sections_excluded"] += 1
+        return keep
+
+    def report(self) -> dict:
+        return {
+            key: self.counts[key]
+            for key in (
+                "departments_kept",
+                "departments_excluded",
+                "courses_kept",
+                "courses_excluded",
+                "sections_kept",
+                "sections_excluded",
+            )
+        }
@@ -2,31 +2,58 @@
 
 import re, requests, json
 
-# Timer
-import time
-
-# get the start time
-st = time.time()
+from collections import Counter
+from typing import TYPE_CHECKING
 
 # Import sfu_api functions
-from sfu_api import SFUCoursesAPI
+from controllers.sfu_api import SFUCoursesAPI, DEFAULT_TERM
+from controllers.profiling import profiled
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+# Tables holding each department's rows, children first
+CHILD_TABLES = ("schedules", "instructors", "sections", "courses")
+
 
-# Load dotenv environmental variables
-from dotenv import load_dotenv
-import os
+def get_supabase_client() -> "Client":
+    """
+    Create a Supabase client from the supabase_url / supabase_key
+    environment variables (loaded from .env if present).
+
+    dotenv and supabase are imported here rather than at module level
+    so that importing this module has no side effects.
+    """
 
-load_dotenv()
+    # Load dotenv environmental variables
+    from dotenv import load_dotenv
+    import os
 
-SUPABASE_URL = os.getenv("supabase_url")
-SUPABASE_KEY = os.getenv("supabase_key")
+    load_dotenv()
 
-# Supabase connection
-import os
-from supabase import create_client, Client
+    # Supabase connection
+    from supabase import create_client
 
-url: str = os.environ.get(SUPABASE_URL)
-key: str = os.environ.get(SUPABASE_KEY)
-# supabase: Client = create_client(url, key)
+    url: str = os.getenv("supabase_url")
+    key: str = os.getenv("supabase_key")
+    return create_client(url, key)
+
+
+def same_row(stored: dict, incoming: dict) -> bool:
+    """
+    Whether a stored row already holds every field of an incoming row.
+    Values are compared as strings too, since the API returns numbers
+    such as enrolment counts as strings while the columns may be ints.
+    """
+
+    for field, value in incoming.items():
+        current = stored.get(field)
+        if current == value:
+            continue
+        if current is None or value is None or str(current) != str(value):
+            return False
+    return True
 
 
 class SupabaseInserter:
@@ -35,14 +62,44 @@ class SupabaseInserter:
     Make the database using the given course options.
     """
 
-    def __init__(self, supabase_client: Client, sfu_data: dict):
+    def __init__(
+        self,
+        supabase_client: "Client",
+        sfu_data: dict,
+        term: str = DEFAULT_TERM,
+        api: SFUCoursesAPI = None,
+        catalog=None,
+        departments: set = None,
+    ):
         self.supabase = supabase_client
         self.sfu_data = sfu_data
-        self.api = SFUCoursesAPI()
+        self.term = term
+        self.api = api if api is not None else SFUCoursesAPI(term)
+
+        # Optional TermCatalog (see term_store.py) that each fully fetched
+        # department replaces its data in, so the served snapshot follows
+        # the database
+        self.catalog = catalog
+
+        # Departments whose sections are fetched and synced (None = all).
+        # The others are left as they are, but still count as listed so
+        # they are not deleted.
+        self.departments = departments
 
+        # Rows written this run, e.g. {"courses_inserted": 3, "sections_updated": 1}
+        self.stats = Counter()
+
+        # Departments left untouched this run because their listings or
+        # section details could not be fetched
+        self.skipped_departments = []
+
+    @profiled
     def fetch_and_sync_all(self):
         self.sync_departments()
+        self.prune_catalog()
         for dept_code, courses in self.sfu_data.items():
+            if self.departments is not None and dept_code not in self.departments:
+                continue
             print(f"Processing department: {dept_code}")
             # self.sync_department(dept_code)
 
@@ -50,6 +107,11 @@ class SupabaseInserter:
             section_entries = []
             instructor_entries = []
             schedule_entries = []
+            fetched = []
+
+            # Syncing a partly fetched department would delete or blank
+            # the rows that failed to fetch
+            incomplete = dept_code in self.api.failed_departments
 
             for course_number, sections in courses.items():
                 for section_id in sections:
@@ -57,6 +119,10 @@ class SupabaseInserter:
                     section_info = self.api.get_section_info(
                         dept_code, course_number, section_id
                     )
+                    if not section_info:
+                        incomplete = True
+                        continue
+                    fetched.append((course_number, section_id, section_info))
 
                     # Parse course
                     course_data = self.extract_course_data(
@@ -82,10 +148,35 @@ class SupabaseInserter:
                     )
                     schedule_entries.extend(schedules)
 
-            self.sync_courses(course_entries)
-            self.sync_sections(section_entries)
-            self.sync_instructors(instructor_entries)
-            self.sync_schedules(schedule_entries)
+            if incomplete:
+                self.skipped_departments.append(dept_code)
+                continue
+
+            self.sync_courses(dept_code, course_entries)
+            self.sync_sections(dept_code, section_entries)
+            self.sync_instructors(dept_code, instructor_entries)
+            self.sync_schedules(dept_code, schedule_entries)
+            self.update_catalog(dept_code, fetched)
+
+    def prune_catalog(self):
+        # Drop catalog departments that are no longer listed
+        if self.catalog is None or self.catalog.get_term(self.term) is None:
+            return
+        term = self.catalog.get_term(self.term)
+        listed = {dept.upper() for dept in self.sfu_data}
+        listed |= {dept.upper() for dept in self.api.failed_departments}
+        for dept in set(term.departments) - listed:
+            self.catalog.remove_department(self.term, dept)
+
+    def update_catalog(self, dept_code: str, fetched: list):
+        # Replace the department in the catalog with what was just synced
+        if self.catalog is None:
+            return
+        self.catalog.remove_department(self.term, dept_code)
+        for course_number, section_id, section_info in fetched:
+            self.catalog.add_section_info(
+                self.term, dept_code, course_number, section_id, section_info
+            )
 
     def sync_departments(self):
         # Insert to departments table
@@ -96,21 +187,33 @@ class SupabaseInserter:
 
         incoming_depts = set(self.sfu_data.keys())
 
-        # Determine new and stale departments
+        # Determine new and stale departments; departments whose listing
+        # failed are missing from sfu_data but not gone
         new_depts = incoming_depts - existing_depts
-        stale_depts = existing_depts - incoming_depts
+        stale_depts = existing_depts - incoming_depts - self.api.failed_departments
 
         # Insert new departments
         if new_depts:
             inserts = [{"dept_code": dept} for dept in new_depts]
             self.supabase.table("departments").insert(inserts).execute()
+            self.stats["departments_inserted"] += len(inserts)
 
-        # Delete stale departments
+        # Delete stale departments, after their rows in the tables keyed by
+        # dept_code, which would otherwise be left behind
         if stale_depts:
-            for dept in stale_depts:
-                self.supabase.table("departments").delete().eq(
-                    "dept_code", dept
-                ).execute()
+            for table in CHILD_TABLES:
+                deleted = (
+                    self.supabase.table(table)
+                    .delete()
+                    .in_("dept_code", list(stale_depts))
+                    .execute()
+                )
+                if deleted.data:
+                    self.stats[f"{table}_deleted"] += len(deleted.data)
+            self.supabase.table("departments").delete().in_(
+                "dept_code", list(stale_depts)
+            ).execute()
+            self.stats["departments_deleted"] += len(stale_depts)
 
         return
 
@@ -131,37 +234,99 @@ class SupabaseInserter:
 
         return
 
-    def sync_course(self, course_entries: list):
-        # Insert to courses table
+    def sync_rows(self, table: str, dept_code: str, entries: list, key_fields: tuple):
+        """
+        Make a department's rows in table match entries: insert rows whose
+        key is new, update rows whose other fields changed and delete rows
+        whose key is no longer present.
+
+        Args:
+            table (str): Supabase table name
+            dept_code (str): Department the entries belong to
+            entries (list): Incoming rows, duplicates by key are dropped
+            key_fields (tuple): Columns identifying a row
+        """
 
         existing = (
-            self.supabase.table("courses")
-            .select("id, dept_code, course_number")
-            .execute()
+            self.supabase.table(table).select("*").eq("dept_code", dept_code).execute()
         )
         existing_map = {
-            (c["dept_code"], c["course_number"]): c["id"] for c in existing.data
+            tuple(row[field] for field in key_fields): row for row in existing.data
         }
 
-        incoming_keys = {(c["dept_code"], c["course_number"]) for c in course_entries}
-
-        # Insert new courses
-        new_courses = [
-            c
-            for c in course_entries
-            if (c["dept_code"], c["course_number"]) not in existing_map
+        incoming = {}
+        for entry in entries:
+            incoming.setdefault(tuple(entry[field] for field in key_fields), entry)
+
+        # Insert new rows
+        new_rows = [row for key, row in incoming.items() if key not in existing_map]
+        if new_rows:
+            self.supabase.table(table).insert(new_rows).execute()
+            self.stats[f"{table}_inserted"] += len(new_rows)
+
+        # Update changed rows, in one upsert keyed by id
+        changed_rows = [
+            dict(row, id=existing_map[key]["id"])
+            for key, row in incoming.items()
+            if key in existing_map and not same_row(existing_map[key], row)
         ]
-        if new_courses:
-            self.supabase.table("courses").insert(new_courses).execute()
+        if changed_rows:
+            self.supabase.table(table).upsert(changed_rows).execute()
+            self.stats[f"{table}_updated"] += len(changed_rows)
 
-        # Delete stale courses
+        # Delete stale rows
         stale_ids = [
-            cid for key, cid in existing_map.items() if key not in incoming_keys
+            row["id"] for key, row in existing_map.items() if key not in incoming
         ]
-        for cid in stale_ids:
-            self.supabase.table("courses").delete().eq("id", cid).execute()
+        if stale_ids:
+            self.supabase.table(table).delete().in_("id", stale_ids).execute()
+            self.stats[f"{table}_deleted"] += len(stale_ids)
         return
 
+    def sync_courses(self, dept_code: str, course_entries: list):
+        # Insert to courses table
+        self.sync_rows(
+            "courses", dept_code, course_entries, ("dept_code", "course_number")
+        )
+
+    def sync_sections(self, dept_code: str, section_entries: list):
+        # Insert to sections table
+        self.sync_rows(
+            "sections",
+            dept_code,
+            section_entries,
+            ("dept_code", "course_id", "section_code"),
+        )
+
+    def sync_instructors(self, dept_code: str, instructor_entries: list):
+        # Insert to instructors table
+        self.sync_rows(
+            "instructors",
+            dept_code,
+            instructor_entries,
+            ("dept_code", "course_number", "section_id", "name"),
+        )
+
+    def sync_schedules(self, dept_code: str, schedule_entries: list):
+        # Insert to schedules table
+        self.sync_rows(
+            "schedules",
+            dept_code,
+            schedule_entries,
+            (
+                "dept_code",
+                "course_number",
+                "section_id",
+                "days",
+                "start_time",
+                "end_time",
+            ),
+        )
+
+    @property
+    def rows_changed(self) -> int:
+        return sum(self.stats.values())
+
     def insert_section(self, section_data: dict):
         # insert to sections table
         pass
@@ -193,9 +358,11 @@ class SupabaseInserter:
             "dept_code": dept,
             "course_id": course_number,
             "section_code": section_id,
-            "class_type": section_info.get("classNumber"),
-            "associated_class": section_info.get("enrollmentCapacity"),
-            "delivery_method": section_info.get("enrollmentTotal"),
+            "class_type": section_info.get("classType"),
+            "associated_class": section_info.get("associatedClass"),
+            "delivery_method": section_info.get("deliveryMethod"),
+            "enrollment_capacity": section_info.get("enrollmentCapacity"),
+            "enrollment_total": section_info.get("enrollmentTotal"),
         }
 
     def extract_instructors(self, section_info, dept, course_number, section_id):
@@ -205,7 +372,12 @@ class SupabaseInserter:
                 "dept_code": dept,
                 "course_number": course_number,
                 "section_id": section_id,
-                "name": instructor,
+                # The API lists instructors as dicts with a "name" key
+                "name": (
+                    instructor.get("name")
+                    if isinstance(instructor, dict)
+                    else instructor
+                ),
             }
             for instructor in instructors
         ]
@@ -226,11 +398,3 @@ class SupabaseInserter:
             }
             for m in meeting_info
         ]
-
-
-# get the end time
-et = time.time()
-
-# get the execution time
-elapsed_time = et - st
-print("Execution time:", elapsed_time, "seconds")
@@ -0,0 +1,288 @@
+# free_time.py
+
+# "Fill my free time" search: which sections fit around an existing
+# timetable. Every section's meeting times are precomputed into a bitmap of
+# 10 minute slots over the week (a Python int), so checking a section
+# against the occupied time is a single AND, and the whole catalogue can be
+# scanned in a few milliseconds.
+
+import re
+
+from controllers.term_store import DAY_BITS, DAY_PATTERN, days_mask, minutes
+
+SLOT_MINUTES = 10
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+# Sections starting or ending within this many slots of occupied time count
+# as adjacent. Covers SFU's 10 minute passing period (10:30-11:20 then 11:30),
+# since an end time of 11:20 fills slots up to 11:20 and 11:30 starts a slot
+# later.
+ADJACENT_SLOTS = 2
+
+MAX_RESULTS = 1000
+# "HH:MM" from 00:00 to 23:59, plus 24:00 for blocks that run to midnight
+TIME_PATTERN = re.compile(r"([01]?\d|2[0-3]):[0-5]\d|24:00")
+
+
+def time_mask(days: str, start_time: str, end_time: str) -> int:
+    """
+    Bitmap of the slots covered on the given days between start and end,
+    e.g. ("Mo, We", "10:30", "11:20"). Returns 0 if a time is missing.
+    """
+
+    start, end = minutes(start_time), minutes(end_time)
+    if start < 0 or end <= start:
+        return 0
+
+    first = start // SLOT_MINUTES
+    last = -(-end // SLOT_MINUTES)  # round up so partial slots count
+    day_block = ((1 << (last - first)) - 1) << first
+
+    mask = 0
+    day_bits = days_mask(days)
+    for day_index in range(len(DAY_BITS)):
+        if day_bits & (1 << day_index):
+            mask |= day_block << (day_index * SLOTS_PER_DAY)
+    return mask
+
+
+def _day_edges(width: int) -> tuple:
+    """
+    Bitmaps of the first and of the last width slots of every day.
+    """
+
+    first = last = 0
+    for day_index in range(len(DAY_BITS)):
+        block = (1 << width) - 1
+        first |= block << (day_index * SLOTS_PER_DAY)
+        last |= block << ((day_index + 1) * SLOTS_PER_DAY - width)
+    return first, last
+
+
+# Indexed by shift, see neighbour_mask
+_DAY_EDGES = [_day_edges(width) for width in range(ADJACENT_SLOTS + 1)]
+
+
+def neighbour_mask(occupied: int, width: int = ADJACENT_SLOTS) -> int:
+    """
+    Free slots within width slots before or after occupied time, on the
+    same day.
+    """
+
+    neighbours = 0
+    for shift in range(1, width + 1):
+        first, last = _DAY_EDGES[shift]
+        # Shifting up moves time later; the first slots of a day would
+        # otherwise pick up the end of the previous day, and vice versa
+        neighbours |= (occupied << shift) & ~first
+        neighbours |= (occupied >> shift) & ~last
+    return neighbours & ~occupied
+
+
+def seats_available(section) -> int:
+    try:
+        return int(section.enrollment_capacity) - int(section.enrollment_total)
+    except (TypeError, ValueError):
+        return -1
+
+
+class SectionIndex:
+    """
+    Precomputed time bitmaps and filter fields for every section of a term.
+    """
+
+    def __init__(self, term):
+        self.term = term.name
+        self.version = term.version
+
+        # Parallel lists, one entry per section
+        self.masks = []
+        self.entries = []
+
+        for dept, courses in term.departments.items():
+            for course in courses.values():
+                for section in course.sections.values():
+                    mask = 0
+                    campuses = set()
+                    for m in section.meeting_times:
+                        mask |= time_mask(m.days, m.start_time, m.end_time)
+                        if m.campus:
+                            campuses.add(m.campus.lower())
+
+                    self.masks.append(mask)
+                    self.entries.append((dept, course, section, frozenset(campuses)))
+
+    def search(
+        self,
+        occupied: int,
+        departments=None,
+        designation: str = None,
+        campus: str = None,
+        units=None,
+        include_unscheduled: bool = False,
+        limit: int = 100,
+    ) -> dict:
+        """
+        Sections that do not overlap the occupied bitmap, best first.
+
+        Sections that sit right next to already occupied time rank higher
+        (they keep the timetable compact), then sections with more seats
+        available.
+
+        Returns in form :
+        {"count": <int (all matches)>, "results": [<dict (section)>, ...]}
+        """
+
+        departments = None if departments is None else {d.upper() for d in departments}
+        designation = designation.lower() if designation else None
+        campus = campus.lower() if campus else None
+        units = None if units is None else {str(u) for u in units}
+
+        neighbours = neighbour_mask(occupied)
+
+        matches = []
+        for mask, entry in zip(self.masks, self.entries):
+            if mask & occupied:
+                continue
+            if not mask and not include_unscheduled:
+                continue
+
+            dept, course, section, campuses = entry
+            if departments is not None and dept not in departments:
+                continue
+            if (
+                designation is not None
+                and designation not in (course.designation or "").lower()
+            ):
+                continue
+            if campus is not None and campus not in campuses:
+                continue
+            if units is not None and str(course.units) not in units:
+                continue
+
+            matches.append(
+                ((mask & neighbours).bit_count(), seats_available(section), entry)
+            )
+
+        matches.sort(key=lambda match: (-match[0], -match[1]))
+        return {
+            "count": len(matches),
+            "results": [
+                {
+                    "section": f"{dept}/{course.number}/{section.code}",
+                    "title": course.title,
+                    "units": course.units,
+                    "designation": course.designation,
+                    "campuses": sorted(campuses),
+                    "seats_available": seats,
+                    "adjacent_slots": adjacency,
+                }
+                for adjacency, seats, (dept, course, section, campuses) in matches[
+                    :limit
+                ]
+            ],
+        }
+
+
+def occupied_mask(term, busy=(), sections=()) -> int:
+    """
+    Bitmap of a timetable given as busy blocks and/or section keys.
+
+    Args:
+        term (Term): Term the sections belong to
+        busy (list): [{"days": "Mo, We", "start": "10:30", "end": "11:20"}, ...]
+        sections (list): ["CMPT/225/D100", ...]
+    """
+
+    mask = 0
+    for block in busy:
+        mask |= time_mask(block.get("days"), block.get("start"), block.get("end"))
+    for key in sections:
+        parts = key.split("/")
+        section = term.get_section(*parts) if len(parts) == 3 else None
+        if section is not None:
+            for m in section.meeting_times:
+                mask |= time_mask(m.days, m.start_time, m.end_time)
+    return mask
+
+
+def _string_list(value, name: str):
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{name} must be a list of strings")
+    return value
+
+
+def _optional_string(value, name: str):
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    return value
+
+
+def _checked_time(value, name: str) -> int:
+    """
+    Minutes since midnight of a "HH:MM" time from a request.
+    """
+
+    if not isinstance(value, str) or not TIME_PATTERN.fullmatch(value):
+        raise ValueError(f"{name} must be a time in form HH:MM")
+    return minutes(value)
+
+
+def parse_search_request(term, body) -> tuple:
+    """
+    Validate a free time search request body (see
+    routes/course.search_free_time).
+
+    Returns:
+        tuple: (<int (occupied bitmap)>, <dict (SectionIndex.search kwargs)>)
+
+    Raises:
+        ValueError: If the body is malformed, with a message for the client
+    """
+
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    busy = body.get("busy", [])
+    if not isinstance(busy, list) or not all(isinstance(b, dict) for b in busy):
+        raise ValueError("busy must be a list of objects")
+    for block in busy:
+        days = block.get("days")
+        if not isinstance(days, str) or not DAY_PATTERN.search(days):
+            raise ValueError('busy days must name weekdays, e.g. "Mo, We"')
+        start = _checked_time(block.get("start"), "busy start")
+        end = _checked_time(block.get("end"), "busy end")
+        if end <= start:
+            raise ValueError("busy end must be after its start")
+
+    # An unknown section would leave a clash out of the occupied time
+    sections = _string_list(body.get("sections", []), "sections") or []
+    unknown = [
+        key
+        for key in sections
+        if key.count("/") != 2 or term.get_section(*key.split("/")) is None
+    ]
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+
+    filters = body.get("filters", {})
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be an object")
+    include_unscheduled = filters.get("include_unscheduled", False)
+    if not isinstance(include_unscheduled, bool):
+        raise ValueError("include_unscheduled must be a boolean")
+
+    limit = body.get("limit", 100)
+    if not isinstance(limit, int) or isinstance(limit, bool):
+        raise ValueError("limit must be an integer")
+
+    return occupied_mask(term, busy, sections), {
+        "departments": _string_list(filters.get("departments"), "departments"),
+        "designation": _optional_string(filters.get("designation"), "designation"),
+        "campus": _optional_string(filters.get("campus"), "campus"),
+        "units": _string_list(filters.get("units"), "units"),
+        "include_unscheduled": include_unscheduled,
+        "limit": max(0, min(limit, MAX_RESULTS)),
+    }
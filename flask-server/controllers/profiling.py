@@ -0,0 +1,237 @@
+# profiling.py
+
+# Opt-in sampling profiler for the sync, crawl, transcript and request hot
+# paths. Off by default; when a profiled call runs with profiling on, a
+# background thread samples the calling thread's stack (sys._current_frames)
+# every few milliseconds. Allocation tracking with tracemalloc can be added
+# on top. Each profiled call writes to PROFILE_DIR :
+#     <time>-<name>-<pid>-<n>.collapsed     stacks for flamegraph.pl / speedscope
+# and with allocation tracking :
+#     <time>-<name>-<pid>-<n>.tracemalloc   tracemalloc.Snapshot.load()-able dump
+#     <time>-<name>-<pid>-<n>-alloc.txt     top allocation sites
+#
+# Environment :
+#     PROFILE=1                 profile every wrapped call, and a sample of
+#                               requests
+#     PROFILE_SAMPLE_RATE=0.01  fraction of requests profiled under PROFILE=1
+#     PROFILE_HEADER=1          also profile requests sent with "X-Profile: 1"
+#     PROFILE_DIR=<path>        output directory (default flask-server/data/profiles)
+#     PROFILE_INTERVAL_MS=5     sampling interval
+#     PROFILE_ALLOC_FRAMES=0    tracemalloc traceback depth, 0 = no allocation
+#                               tracking. Sampling costs next to nothing, but
+#                               tracemalloc slows the whole process ~4x at
+#                               depth 1, so only turn it on for a short run.
+#
+# Streaming responses (e.g. the seat event streams) are only profiled up to
+# the point the response is returned, not for the life of the connection.
+#
+# e.g. PROFILE=1 python -m scripts.update_db 2025/fall --once
+#      flamegraph.pl data/profiles/*fetch_and_sync_all*.collapsed > sync.svg
+
+import functools, itertools, os, random, sys, threading, time
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILE_HEADER = "X-Profile"
+DEFAULT_PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "profiles"
+)
+ALLOCATION_TOP = 25
+
+# Profiling state of the current thread, so nested profiled calls (e.g.
+# crawl_term -> get_courses) only record once, under the outermost call
+_local = threading.local()
+
+# tracemalloc is process wide; concurrent profiles share one trace
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+# Keeps file names unique when one endpoint is profiled twice in a second
+_sequence = itertools.count()
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("PROFILE", "") not in ("", "0")
+
+
+def profile_dir() -> str:
+    return os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR)
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples one thread's Python stack at a fixed interval, counting
+    identical stacks. Costs nothing in the sampled thread beyond the GIL
+    hand-offs, so it stays usable on production paths.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name=f"profiler-{thread_id}", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.labels = {}
+        self.stopped = threading.Event()
+
+    def label(self, code) -> str:
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = (
+                f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                f":{code.co_firstlineno})"
+            ).replace(";", ":")
+        return label
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self.label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """
+        Stacks in collapsed form, one "root;...;leaf <count>" per line.
+        """
+
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def _start_tracemalloc(frames: int):
+    global _tracemalloc_users
+    import tracemalloc
+
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    import tracemalloc
+
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot()
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+    return snapshot
+
+
+def _write_profile(name: str, sampler: StackSampler, snapshot, seconds: float):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(directory, f"{stamp}-{name}-{os.getpid()}-{next(_sequence)}")
+
+    with open(base + ".collapsed", "w") as f:
+        f.write(sampler.collapsed())
+    if snapshot is not None:
+        snapshot.dump(base + ".tracemalloc")
+        with open(base + "-alloc.txt", "w") as f:
+            for stat in snapshot.statistics("lineno")[:ALLOCATION_TOP]:
+                f.write(f"{stat}\n")
+
+    samples = sum(sampler.stacks.values())
+    print(f"[profile] {name}: {seconds:.4f}s, {samples} samples -> {base}.*")
+
+
+@contextmanager
+def profile(name: str):
+    """
+    Profile the enclosed block on the current thread and write the results
+    to profile_dir(). Nested profiles on the same thread are no-ops.
+    """
+
+    if getattr(_local, "active", False):
+        yield
+        return
+
+    interval = float(os.getenv("PROFILE_INTERVAL_MS", 5)) / 1000
+    alloc_frames = int(os.getenv("PROFILE_ALLOC_FRAMES", 0))
+    sampler = StackSampler(threading.get_ident(), interval)
+    _local.active = True
+    if alloc_frames > 0:
+        _start_tracemalloc(alloc_frames)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        sampler.stop()
+        snapshot = _stop_tracemalloc() if alloc_frames > 0 else None
+        _local.active = False
+        _write_profile(name, sampler, snapshot, seconds)
+
+
+def profiled(func):
+    """
+    Decorator profiling each call of func while PROFILE is set. When it is
+    not, the only overhead is an environment lookup.
+    """
+
+    name = func.__qualname__.replace("<", "").replace(">", "")
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not profiling_enabled() or getattr(_local, "active", False):
+            return func(*args, **kwargs)
+        with profile(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def init_profiling(app):
+    """
+    Profile a sample of Flask requests while PROFILE is set (see
+    PROFILE_SAMPLE_RATE), or per request with the X-Profile header when
+    PROFILE_HEADER is set. Header profiling is off by default, since
+    anyone who can reach the app could otherwise turn it on.
+    """
+
+    from flask import g, request
+
+    app.config.setdefault(
+        "PROFILE_HEADER", os.getenv("PROFILE_HEADER", "") not in ("", "0")
+    )
+    app.config.setdefault(
+        "PROFILE_SAMPLE_RATE", float(os.getenv("PROFILE_SAMPLE_RATE", 0.01))
+    )
+
+    def stop(response=None):
+        request_profile = g.pop("profile", None)
+        if request_profile is not None:
+            request_profile.__exit__(None, None, None)
+        return response
+
+    @app.before_request
+    def start_request_profile():
+        asked = request.headers.get(PROFILE_HEADER, "") not in ("", "0")
+        wanted = (app.config["PROFILE_HEADER"] and asked) or (
+            profiling_enabled() and random.random() < app.config["PROFILE_SAMPLE_RATE"]
+        )
+        if wanted and not getattr(_local, "active", False):
+            g.profile = profile(f"request.{request.endpoint or 'unknown'}")
+            g.profile.__enter__()
+
+    @app.after_request
+    def stop_streaming_profile(response):
+        # A stream can stay open for hours; stop at the handler's return
+        # rather than when the connection closes
+        if response.is_streamed:
+            return stop(response)
+        return response
+
+    @app.teardown_request
+    def stop_request_profile(exc):
+        stop()
@@ -0,0 +1,258 @@
+# seat_tracker.py
+
+# Lightweight polling of enrolment counts for watched sections.
+# During enrolment seat counts change constantly while everything else is
+# static, so instead of a full crawl only the watched sections are
+# refreshed. Each section keeps a compact time series of its counts, and
+# subscribers are pushed every change (see routes/seats.py for the
+# server-sent events stream).
+#
+# A tracker only coalesces polls within its own process, so the seat routes
+# are served by one dedicated process (gunicorn_seats.conf.py) rather than
+# by every web worker.
+
+import queue, threading, time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from controllers.sfu_api import SFUCoursesAPI
+
+
+def section_key(dept: str, course: str, section: str) -> str:
+    """
+    Key of a section, e.g. ("cmpt", "225", "d100") -> "CMPT/225/D100"
+    """
+
+    return f"{dept}/{course}/{section}".upper()
+
+
+def seat_count(value) -> int:
+    """
+    Enrolment count from the API ("120", 120 or None), -1 if unknown
+    """
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+class SeatSeries:
+    """
+    Time series of a section's enrolment counts. A point is only stored
+    when the counts change, and only the latest max_points are kept.
+    """
+
+    __slots__ = ("times", "capacity", "total", "max_points")
+
+    def __init__(self, max_points: int):
+        self.times = array("q")
+        self.capacity = array("l")
+        self.total = array("l")
+        self.max_points = max_points
+
+    def record(self, when: int, capacity: int, total: int) -> bool:
+        """
+        Returns True if the counts changed (and a point was stored).
+        """
+
+        if self.times and self.capacity[-1] == capacity and self.total[-1] == total:
+            return False
+
+        self.times.append(when)
+        self.capacity.append(capacity)
+        self.total.append(total)
+        if len(self.times) > self.max_points:
+            del self.times[0], self.capacity[0], self.total[0]
+        return True
+
+    def latest(self) -> dict:
+        if not self.times:
+            return None
+        return {
+            "time": self.times[-1],
+            "capacity": self.capacity[-1],
+            "total": self.total[-1],
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "times": self.times.tolist(),
+            "capacity": self.capacity.tolist(),
+            "total": self.total.tolist(),
+        }
+
+
+class SeatTracker:
+    """
+    Polls enrolment counts of watched sections of one term.
+
+    Args:
+        term (str): Term in form <year>/<semester>
+        interval (float): Seconds between polls
+        max_points (int): Points kept per section's time series
+        max_workers (int): Courses fetched concurrently per poll
+        api_url (str): Course outlines API to poll (see SFUCoursesAPI)
+    """
+
+    def __init__(
+        self,
+        term: str,
+        interval: float = 30,
+        max_points: int = 2880,
+        max_workers: int = 4,
+        api_url: str = None,
+    ):
+        self.term = term
+        self.interval = interval
+        self.max_points = max_points
+        self.api_url = api_url
+
+        # { <string (section key)> : <int (watchers)> }
+        self.watched = {}
+        # { <string (section key)> : <SeatSeries> }
+        self.series = {}
+        # { <queue.Queue> : <set (section keys)> }
+        self.subscribers = {}
+        # { <string (section key)> : <set (queue.Queue)> }
+        self.listeners = {}
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _api(self) -> SFUCoursesAPI:
+        # requests sessions are not thread-safe, so one client per pool thread
+        api = getattr(self._local, "api", None)
+        if api is None:
+            kwargs = {"api_url": self.api_url} if self.api_url else {}
+            api = self._local.api = SFUCoursesAPI(self.term, **kwargs)
+        return api
+
+    def watch(self, keys):
+        with self._lock:
+            for key in keys:
+                self.watched[key] = self.watched.get(key, 0) + 1
+        self.start()
+
+    def unwatch(self, keys):
+        with self._lock:
+            for key in keys:
+                count = self.watched.get(key, 0) - 1
+                if count > 0:
+                    self.watched[key] = count
+                else:
+                    self.watched.pop(key, None)
+
+    def subscribe(self, keys) -> queue.Queue:
+        """
+        Watch keys and return a queue that receives a dict for every
+        change of their counts, in form :
+        {"section": <string (key)>, "time": <int>, "capacity": <int>, "total": <int>}
+        """
+
+        keys = set(keys)
+        events = queue.Queue(maxsize=1000)
+        with self._lock:
+            self.subscribers[events] = keys
+            for key in keys:
+                self.listeners.setdefault(key, set()).add(events)
+        self.watch(keys)
+        return events
+
+    def unsubscribe(self, events: queue.Queue):
+        with self._lock:
+            keys = self.subscribers.pop(events, ())
+            for key in keys:
+                listeners = self.listeners.get(key)
+                listeners.discard(events)
+                if not listeners:
+                    del self.listeners[key]
+        self.unwatch(keys)
+
+    def latest(self, key: str) -> dict:
+        series = self.series.get(key)
+        return series.latest() if series is not None else None
+
+    def poll_once(self) -> int:
+        """
+        Refresh every watched section once. Sections are grouped by
+        course and each course's sections are fetched back to back on
+        one connection, so watchers of the same section or course share
+        the work.
+
+        Returns:
+            int: Number of sections whose counts changed
+        """
+
+        with self._lock:
+            keys = list(self.watched)
+
+        by_course = {}
+        for key in keys:
+            dept, course, section = key.split("/")
+            by_course.setdefault((dept, course), []).append(section)
+
+        changed = 0
+        for count in self._pool.map(self._poll_course, by_course.items()):
+            changed += count
+        return changed
+
+    def _poll_course(self, item) -> int:
+        (dept, course), sections = item
+        api = self._api()
+        changed = 0
+        for section in sections:
+            section_info = api.fetch_section_info(dept, course, section.lower())
+            if not section_info:
+                continue
+            if self._record(
+                section_key(dept, course, section),
+                seat_count(section_info.get("enrollmentCapacity")),
+                seat_count(section_info.get("enrollmentTotal")),
+            ):
+                changed += 1
+        return changed
+
+    def _record(self, key: str, capacity: int, total: int) -> bool:
+        when = int(time.time())
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = SeatSeries(self.max_points)
+            if not series.record(when, capacity, total):
+                return False
+            listeners = list(self.listeners.get(key, ()))
+
+        event = {"section": key, "time": when, "capacity": capacity, "total": total}
+        for events in listeners:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                # A stalled subscriber misses updates rather than blocking polls
+                pass
+        return True
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            if self.watched:
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    print(f"[seats] poll failed: {e!r}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """
+        Start polling in a daemon thread, once.
+        """
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run_forever, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -2,54 +2,64 @@
 
 # Logic for fetching courses from API
 import re, requests, json
-from testing import timer
+from collections import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from controllers.testing import timer
+from controllers.crawl_filter import CrawlFilter
+from controllers.profiling import profiled
+
+COURSE_OUTLINES_URL = "http://www.sfu.ca/bin/wcm/course-outlines"
+DEFAULT_TERM = "2025/spring"
 
 
 class SFUCoursesAPI:
     def __init__(
-        self, base_url: str = "http://www.sfu.ca/bin/wcm/course-outlines?2025/spring"
+        self,
+        term: str = DEFAULT_TERM,
+        api_url: str = COURSE_OUTLINES_URL,
+        crawl_filter: CrawlFilter = None,
+        max_retries: int = 3,
     ):
 
+        # Term in form <year>/<semester>, e.g. "2025/spring"
+        self.term: str = term
+
         # URL for departments in this semester
-        self.base_url: str = base_url
-        self.excluded_departments = {
-            "GERO",
-            "LBST",
-            "PLAN",
-            "ALS",
-            "APMA",
-            "ARAB",
-            "CENV",
-            "DMED",
-            "EDPR",
-            "FAL",
-            "FAN",
-            "FASS",
-            "GERM",
-            "GRAD",
-            "GRK",
-            "INS",
-            "ITAL",
-            "LBRL",
-            "LS",
-            "NEUR",
-            "NUSC",
-            "ONC",
-            "PERS",
-            "PLCY",
-            "PORT",
-            "SD",
-            "SDA",
-            "SPAN",
-            "TEKX",
-            "UGRAD",
-            "URB",
-            "WS",
-            "WKTM",
-            "WDA",
-        }
+        self.base_url: str = f"{api_url}?{term}"
+
+        # Rules for pruning the crawl before child requests are issued
+        self.crawl_filter: CrawlFilter = (
+            crawl_filter if crawl_filter is not None else CrawlFilter.default()
+        )
+
+        # One session reuses connections across the crawl's requests
+        self.session = requests.Session()
+
+        # Retry rate limited and failed requests with backoff (honours Retry-After)
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+        self.session.mount("http://", HTTPAdapter(max_retries=retry))
+        self.session.mount("https://", HTTPAdapter(max_retries=retry))
+        self.session.hooks["response"].append(self._count_request)
+        self.request_count: int = 0
+
+        # Listings that still failed after retries during the last crawl,
+        # e.g. {"departments": 1, "courses": 2}, and the departments whose
+        # data is incomplete because of them
+        self.failures = Counter()
+        self.failed_departments: set = set()
+
+    def _count_request(self, response, *args, **kwargs):
+        self.request_count += 1
 
     @timer
+    @profiled
     def get_departments(self) -> list:
         """
         Send Get request to SFU Courses API to
@@ -59,20 +69,25 @@ class SFUCoursesAPI:
         [<string>, <string>, ...]
         """
 
+        self.crawl_filter.reset()
+        self.failures.clear()
+        self.failed_departments.clear()
+
         try:
-            response = requests.get(self.base_url)
+            response = self.session.get(self.base_url)
             response.raise_for_status()  # Raise an error for HTTP errors
 
             department_list = [
                 department["text"]
                 for department in response.json()
-                if department["text"] not in self.excluded_departments
+                if self.crawl_filter.keep_department(department["text"])
             ]
             return department_list
         except requests.exceptions.RequestException as e:
             return {"error": str(e)}
 
     @timer
+    @profiled
     def get_courses(self) -> dict:
         """
         Send Get request to SFU Courses API to
@@ -84,39 +99,45 @@ class SFUCoursesAPI:
                 <dict (course) >
             ]
         }
+
+        Departments whose listing still fails after retries are left out
+        and recorded in self.failed_departments. Raises RequestException
+        if the department listing itself cannot be fetched.
         """
 
-        # Make sure course numbers are below 500
+        # Departments and courses excluded by the crawl filter are never fetched
         departments_list = self.get_departments()
+        if isinstance(departments_list, dict):
+            # Without the department listing there is nothing to crawl
+            raise requests.exceptions.RequestException(departments_list["error"])
+
         sfu_courses = {}
         for department in departments_list:
             try:
-                response = requests.get(self.base_url + "/" + department)
+                response = self.session.get(self.base_url + "/" + department)
                 response.raise_for_status()  # Raise an error for HTTP errors
-                sfu_courses[department] = []
-
-                for course in response.json():
-                    if int(re.sub(r"[^\d]", "", course["text"])) > 500:
-                        continue
-                    elif "title" in course and (
-                        "Practicum" in course["title"]
-                        or "Research Project" in course["title"]
-                    ):
-                        continue
-                    else:
-                        sfu_courses[department].append(course)
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
+                sfu_courses[department] = [
+                    course
+                    for course in response.json()
+                    if self.crawl_filter.keep_course(course)
+                ]
+            except requests.exceptions.RequestException as e:
+                response = getattr(e, "response", None)
+                if response is not None and response.status_code == 404:
                     # Just skip and move on
-                    # print(f"404 Not Found for {department}, skipping.")
                     continue
-                else:
-                    # print(f"HTTP error for {department}: {e}")
-                    return {"error": str(e)}
-
+                # Still failing after retries (5xx, 429, connection errors),
+                # skip it too but remember the department is incomplete
+                self.failures["departments"] += 1
+                self.failed_departments.add(department)
+
+        print(f"[crawl_filter] {self.crawl_filter.report()}")
+        if self.failures:
+            print(f"[crawl] failed listings: {dict(self.failures)}")
         return sfu_courses
 
     @timer
+    @profiled
     def get_course_sections(self) -> dict:
         """
         Send Get request to SFU Courses API to
@@ -142,14 +163,23 @@ class SFUCoursesAPI:
             #     course_dict[department] = course_section_dict
             #     continue
             for course in courses:
-                response = requests.get(
-                    self.base_url + "/" + department + "/" + course["text"]
-                )
+                try:
+                    response = self.session.get(
+                        self.base_url + "/" + department + "/" + course["text"]
+                    )
+                except requests.exceptions.RequestException:
+                    response = None
+                # 404s and requests that still failed after retries are skipped
+                if response is None or not response.ok:
+                    if response is None or response.status_code != 404:
+                        self.failures["courses"] += 1
+                        self.failed_departments.add(department)
+                    continue
                 sections = response.json()
 
                 grouped_sections = {}
                 for section in sections:
-                    if response.status_code == 404:
+                    if not self.crawl_filter.keep_section(section):
                         continue
 
                     associated_number = section["associatedClass"]
@@ -160,10 +190,13 @@ class SFUCoursesAPI:
                 course_section_dict[course["text"]] = grouped_sections
             course_dict[department] = course_section_dict
 
+        print(f"[crawl_filter] {self.crawl_filter.report()}")
+        if self.failures:
+            print(f"[crawl] failed listings: {dict(self.failures)}")
         return course_dict
-        # same logic...
 
     @timer
+    @profiled
     def get_course_outlines(self) -> dict:
         """
         Send Get request to SFU Courses API to
@@ -190,24 +223,15 @@ class SFUCoursesAPI:
             #     course_dict[department] = course_section_dict
             #     continue
 
-            for course in courses:
-                response = requests.get(self.base_url + "/" + department + "/" + course)
-                sections = response.json()
-
-                grouped_sections = []
-
-                for section in sections:
-                    if response.status_code == 404:
-                        continue
-
-                    # No need to associate here, we alrdy have it in db
-
-                    # associated_number = section["associatedClass"]
-                    # if associated_number not in grouped_sections:
-                    #     grouped_sections[associated_number] = []
-
-                    # grouped_sections[associated_number].append(section)
-                    grouped_sections.append(section["value"])
+            for course, sections_by_class in courses.items():
+                # Sections were already fetched and filtered by
+                # get_course_sections, so reuse them instead of refetching.
+                # No need to associate here, we alrdy have it in db
+                grouped_sections = [
+                    section["value"]
+                    for sections in sections_by_class.values()
+                    for section in sections
+                ]
 
                 course_section_dict[course] = grouped_sections
             course_dict[department] = course_section_dict
@@ -228,10 +252,55 @@ class SFUCoursesAPI:
             dict: Section info or {} if request fails
         """
 
+        return self.fetch_section_info(dept, course, section)
+
+    def fetch_section_info(self, dept: str, course: str, section: str) -> dict:
+        """
+        get_section_info without the timing output, for paths that fetch
+        sections continuously (e.g. seat polling).
+        """
+
         try:
             url = f"{self.base_url}/{dept}/{course}/{section}"
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException:
             return {}
+
+    @timer
+    @profiled
+    def crawl_term(self, catalog, include_section_info: bool = True):
+        """
+        Crawl this semester into a TermCatalog (see term_store.py).
+
+        Args:
+            catalog (TermCatalog): Catalog to load the term into
+            include_section_info (bool): Also fetch each section's details
+                (instructors, meeting times, enrolment)
+
+        Returns:
+            Term: The loaded term
+        """
+
+        course_sections = self.get_course_sections()
+        term = catalog.load_term(self.term, course_sections)
+
+        if include_section_info:
+            for dept, courses in course_sections.items():
+                for course, sections_by_class in courses.items():
+                    for sections in sections_by_class.values():
+                        for section in sections:
+                            section_info = self.get_section_info(
+                                dept, course, section["value"]
+                            )
+                            if section_info:
+                                catalog.add_section_info(
+                                    self.term,
+                                    dept,
+                                    course,
+                                    section["text"],
+                                    section_info,
+                                )
+
+        return term
@@ -1,14 +1,27 @@
 # Logic for fetching courses from API
 
-import re, requests, json
+import requests, json
+from controllers.crawl_filter import CrawlFilter, DEFAULT_EXCLUDED_TITLE_KEYWORDS
 
-# URL for departments in this semester
-COURSE_API_URL = "http://www.sfu.ca/bin/wcm/course-outlines?2025/summer"
+# URL for the course outlines API, queried as COURSE_API_URL?<year>/<semester>
+COURSE_API_URL = "http://www.sfu.ca/bin/wcm/course-outlines"
+DEFAULT_TERM = "2025/summer"
 
-# URL for courses for this department in this semester
+# Undergraduate courses only, without practicums or research projects
+CRAWL_FILTER = CrawlFilter(
+    max_level=500, exclude_title_keywords=DEFAULT_EXCLUDED_TITLE_KEYWORDS
+)
 
 
-def get_sfu_departments() -> list:
+def term_url(term: str = DEFAULT_TERM) -> str:
+    """
+    URL for departments in the given semester, e.g. "2025/summer"
+    """
+
+    return f"{COURSE_API_URL}?{term}"
+
+
+def get_sfu_departments(term: str = DEFAULT_TERM) -> list:
     """
     Send Get request to SFU Courses API to
     fetch course departments listed for this semester.
@@ -18,7 +31,7 @@ def get_sfu_departments() -> list:
     """
 
     try:
-        response = requests.get(COURSE_API_URL)
+        response = requests.get(term_url(term))
         response.raise_for_status()  # Raise an error for HTTP errors
         department_list = [department["text"] for department in response.json()]
         return department_list
@@ -26,7 +39,7 @@ def get_sfu_departments() -> list:
         return {"error": str(e)}
 
 
-def get_sfu_courses() -> dict:
+def get_sfu_courses(term: str = DEFAULT_TERM) -> dict:
     """
     Send Get request to SFU Courses API to
     fetch courses for each department listed for this semester.
@@ -39,32 +52,25 @@ def get_sfu_courses() -> dict:
     }
     """
 
-    # Make sure course numbers are below 500
-    departments_list = get_sfu_departments()
+    # Courses excluded by CRAWL_FILTER are dropped before their sections are fetched
+    CRAWL_FILTER.reset()
+    departments_list = get_sfu_departments(term)
     sfu_courses = {}
     for department in departments_list:
         try:
-            response = requests.get(COURSE_API_URL + "/" + department)
+            response = requests.get(term_url(term) + "/" + department)
             response.raise_for_status()  # Raise an error for HTTP errors
-            sfu_courses[department] = []
-
-            for course in response.json():
-                if int(re.sub(r"[^\d]", "", course["text"])) > 500:
-                    continue
-                elif "title" in course and (
-                    "Practicum" in course["title"]
-                    or "Research Project" in course["title"]
-                ):
-                    continue
-                else:
-                    sfu_courses[department].append(course)
+            sfu_courses[department] = [
+                course for course in response.json() if CRAWL_FILTER.keep_course(course)
+            ]
         except requests.exceptions.RequestException as e:
             return {"error": str(e)}
 
+    print(f"[crawl_filter] {CRAWL_FILTER.report()}")
     return sfu_courses
 
 
-def get_course_sections():
+def get_course_sections(term: str = DEFAULT_TERM):
     """
     Send Get request to SFU Courses API to
     fetch course sections for each course listed for this semester.
@@ -81,7 +87,7 @@ def get_course_sections():
 
     """
 
-    course_dict = get_sfu_courses()
+    course_dict = get_sfu_courses(term)
 
     for department, courses in course_dict.items():
         course_section_dict = {}
@@ -90,7 +96,7 @@ def get_course_sections():
             continue
         for course in courses:
             response = requests.get(
-                COURSE_API_URL + "/" + department + "/" + course["text"]
+                term_url(term) + "/" + department + "/" + course["text"]
             )
             sections = response.json()
 
@@ -110,7 +116,7 @@ def get_course_sections():
     return course_dict
 
 
-def get_course_outlines():
+def get_course_outlines(term: str = DEFAULT_TERM):
     """
     Send Get request to SFU Courses API to
     fetch course outlines for each course listed for this semester.
@@ -128,7 +134,7 @@ def get_course_outlines():
 
     """
 
-    course_dict = get_sfu_courses()
+    course_dict = get_sfu_courses(term)
 
     for department, courses in course_dict.items():
         course_section_dict = {}
@@ -137,7 +143,7 @@ def get_course_outlines():
             continue
         for course in courses:
             response = requests.get(
-                COURSE_API_URL + "/" + department + "/" + course["text"]
+                term_url(term) + "/" + department + "/" + course["text"]
             )
             sections = response.json()
 
@@ -175,4 +181,5 @@ def update_db():
     """"""
 
 
-print(get_course_outlines())
+if __name__ == "__main__":
+    print(get_course_outlines())
@@ -0,0 +1,315 @@
+# sync_scheduler.py
+
+# Runs SupabaseInserter syncs for a term on a schedule.
+# The refresh interval follows the term's phase: frequent while students
+# enrol, rare mid-term. Every run fetches the department listings, but
+# only every few runs is a full pass fetching every section; the runs in
+# between only sync departments whose listings changed recently (or that
+# were skipped last time), most recent first. Runs never overlap, and
+# each run's metrics are appended as one JSON line to a metrics file.
+#
+# Given a data directory, each run also folds the departments it synced
+# into the term snapshot there and extends the term's bundle history, so
+# the server's ETags and bundle versions follow the database. Servers
+# read snapshots at startup (see PRELOAD_TERMS in server.py), so they
+# serve a new version once restarted.
+
+import json, os, threading, time
+from datetime import date, timedelta
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from controllers.db_updater import SupabaseInserter, get_supabase_client
+from controllers.sfu_api import SFUCoursesAPI
+from controllers.term_bundle import load_term_history
+from controllers.term_store import TermCatalog, content_digest, term_file_name
+
+# Month each semester starts in
+TERM_START_MONTH = {"spring": 1, "summer": 5, "fall": 9}
+
+# Enrolment opens roughly this long before classes start ...
+ENROLMENT_OPENS = timedelta(days=75)
+# ... and add/drop closes this long after
+ENROLMENT_CLOSES = timedelta(days=14)
+TERM_LENGTH = timedelta(days=120)
+
+# Seconds between syncs in each phase
+DEFAULT_PHASE_INTERVALS = {
+    "enrolment": 15 * 60,
+    "in_term": 6 * 60 * 60,
+    "off": 24 * 60 * 60,
+}
+
+# Every this many runs is a full pass, the first run included
+DEFAULT_FULL_SYNC_EVERY = 4
+# Seconds a department counts as recently changed after its listing changes
+RECENTLY_CHANGED = 24 * 60 * 60
+
+
+def parse_term(term: str) -> tuple:
+    """
+    Year and semester of a term, e.g. "2025/Fall" -> (2025, "fall")
+
+    Raises ValueError if term is not in form <year>/<semester>.
+    """
+
+    year, _, semester = term.partition("/")
+    semester = semester.lower()
+    if not year.isdigit() or semester not in TERM_START_MONTH:
+        raise ValueError(f'Invalid term {term!r}, expected e.g. "2025/fall"')
+    return int(year), semester
+
+
+def term_phase(term: str, today: date = None) -> str:
+    """
+    Phase of a term on a given day.
+
+    Args:
+        term (str): Term in form <year>/<semester>, e.g. "2025/fall"
+        today (date): Defaults to today
+
+    Returns:
+        str: "enrolment", "in_term" or "off"
+    """
+
+    today = today or date.today()
+    year, semester = parse_term(term)
+    start = date(year, TERM_START_MONTH[semester], 1)
+
+    if start - ENROLMENT_OPENS <= today < start + ENROLMENT_CLOSES:
+        return "enrolment"
+    if start + ENROLMENT_CLOSES <= today < start + TERM_LENGTH:
+        return "in_term"
+    return "off"
+
+
+class SyncScheduler:
+    """
+    Periodically syncs one term into Supabase.
+
+    Args:
+        term (str): Term to sync, e.g. "2025/fall"
+        supabase_client: Defaults to get_supabase_client()
+        phase_intervals (dict): Seconds between runs per phase,
+            see DEFAULT_PHASE_INTERVALS
+        metrics_path (str): JSON lines file each run's metrics are appended to
+        lock_path (str): Lock file that keeps syncs single-flight across
+            processes (None = only within this process)
+        data_dir (str): Directory of the term snapshot to keep up to date
+            (None = only sync Supabase)
+        full_sync_every (int): Every this many runs syncs every department
+            (1 = always)
+
+    Raises ValueError if term is not in form <year>/<semester>.
+    """
+
+    def __init__(
+        self,
+        term: str,
+        supabase_client=None,
+        phase_intervals: dict = None,
+        metrics_path: str = None,
+        lock_path: str = None,
+        data_dir: str = None,
+        full_sync_every: int = DEFAULT_FULL_SYNC_EVERY,
+    ):
+        # Checked up front so a bad term fails here, not in the run loop
+        parse_term(term)
+        self.term = term
+        self.supabase = supabase_client
+        self.phase_intervals = dict(DEFAULT_PHASE_INTERVALS, **(phase_intervals or {}))
+        self.metrics_path = metrics_path
+        self.lock_path = lock_path
+        self.data_dir = data_dir
+        self.catalog = None
+        self.saved_version = None
+        self.full_sync_every = max(1, full_sync_every)
+        self.runs = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        # Per department: digest of its last listing and when it last changed
+        self.department_digests = {}
+        self.last_changed = {}
+        # Departments the last run skipped, retried by the next one
+        self.pending = set()
+        self.last_metrics = None
+
+    def interval(self, today: date = None) -> int:
+        return self.phase_intervals[term_phase(self.term, today)]
+
+    def prioritize(self, sfu_data: dict) -> tuple:
+        """
+        Order sfu_data so departments that changed most recently come
+        first, and record which departments changed this time.
+
+        Returns:
+            tuple: (<dict (reordered sfu_data)>, <list (changed departments)>)
+        """
+
+        now = time.time()
+        changed = []
+        for dept, courses in sfu_data.items():
+            digest = content_digest(courses)
+            if self.department_digests.get(dept) != digest:
+                self.department_digests[dept] = digest
+                self.last_changed[dept] = now
+                changed.append(dept)
+
+        ordered = sorted(sfu_data, key=lambda d: -self.last_changed.get(d, 0))
+        return {dept: sfu_data[dept] for dept in ordered}, changed
+
+    def departments_due(self, sfu_data: dict, full: bool) -> set:
+        """
+        Departments a run syncs: all of them on a full pass, otherwise
+        those that changed within RECENTLY_CHANGED or were skipped by the
+        last run.
+        """
+
+        if full:
+            return set(sfu_data)
+        since = time.time() - RECENTLY_CHANGED
+        return {
+            dept
+            for dept in sfu_data
+            if self.last_changed.get(dept, 0) >= since or dept in self.pending
+        }
+
+    def run_once(self) -> dict:
+        """
+        Run one sync unless another is already running.
+
+        Returns:
+            dict: The run's metrics, or None if it was skipped
+        """
+
+        if not self._lock.acquire(blocking=False):
+            return None
+        lock_file = None
+        try:
+            if self.lock_path is not None and fcntl is not None:
+                lock_file = open(self.lock_path, "w")
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return None
+
+            return self._sync()
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+            self._lock.release()
+
+    def _sync(self) -> dict:
+        started_at = time.time()
+        start = time.perf_counter()
+
+        if self.supabase is None:
+            self.supabase = get_supabase_client()
+
+        full = self.runs % self.full_sync_every == 0
+        self.runs += 1
+
+        api = SFUCoursesAPI(self.term)
+        sfu_data, changed = self.prioritize(api.get_course_outlines())
+        due = self.departments_due(sfu_data, full)
+        catalog = self.load_catalog() if self.data_dir is not None else None
+        inserter = SupabaseInserter(
+            self.supabase,
+            sfu_data,
+            self.term,
+            api=api,
+            catalog=catalog,
+            departments=due,
+        )
+        inserter.fetch_and_sync_all()
+        self.pending = set(inserter.skipped_departments)
+        version = self.save_snapshot() if catalog is not None else None
+
+        metrics = {
+            "term": self.term,
+            "phase": term_phase(self.term),
+            "started_at": started_at,
+            "duration_seconds": time.perf_counter() - start,
+            "requests": api.request_count,
+            "rows_changed": inserter.rows_changed,
+            "rows": dict(inserter.stats),
+            "full_pass": full,
+            "departments": len(sfu_data),
+            "departments_synced": len(due),
+            "departments_changed": changed,
+            "departments_skipped": inserter.skipped_departments,
+            "failed_listings": dict(api.failures),
+            "version": version,
+        }
+        self.export(metrics)
+        return metrics
+
+    def load_catalog(self) -> TermCatalog:
+        """
+        Catalog holding the term's snapshot, read from data_dir on first
+        use so departments a run skips keep their last synced data.
+        """
+
+        if self.catalog is None:
+            self.catalog = TermCatalog()
+            path = os.path.join(self.data_dir, term_file_name(self.term))
+            if os.path.exists(path):
+                self.catalog.load_term_file(path)
+        return self.catalog
+
+    def save_snapshot(self) -> str:
+        """
+        Write the term snapshot and bundle history to data_dir.
+
+        Returns:
+            str: The term's version, or None if nothing has been synced
+        """
+
+        term = self.catalog.get_term(self.term)
+        if term is None:
+            return None
+        if term.version != self.saved_version:
+            os.makedirs(self.data_dir, exist_ok=True)
+            self.catalog.save_term_file(self.term, self.data_dir)
+            load_term_history(term, self.data_dir)
+            self.saved_version = term.version
+        return term.version
+
+    def export(self, metrics: dict):
+        self.last_metrics = metrics
+        line = json.dumps(metrics)
+        print(f"[sync] {line}")
+        if self.metrics_path is not None:
+            os.makedirs(os.path.dirname(self.metrics_path) or ".", exist_ok=True)
+            with open(self.metrics_path, "a") as f:
+                f.write(line + "\n")
+
+    def run_forever(self):
+        """
+        Sync now, then again after each phase interval until stop().
+        """
+
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                # Keep the schedule going; the next run retries
+                print(f"[sync] run failed: {e!r}")
+            self._stop.wait(self.interval())
+
+    def start(self) -> threading.Thread:
+        """
+        Run the schedule in a daemon thread.
+        """
+
+        thread = threading.Thread(target=self.run_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,335 @@
+# term_bundle.py
+
+# Compact encoding of a term for the SFUSmartSchedule frontend.
+#
+# Every string is replaced by its index in one "strings" table (-1 for None),
+# and meeting times are packed into a flat list of ints. The table is
+# append-only across versions of a term, so a patch between two versions
+# only has to carry the new strings and the departments that changed.
+#
+# Full bundle :
+# {
+#     "format": 1,
+#     "term": <string>,
+#     "version": <string>,
+#     "strings": [<string>, ...],
+#     "departments": {
+#         <string (department)> : {
+#             "digest": <string>,
+#             "courses": [[number, title, units, designation], ...],
+#             "sections": [[course_index, code, section_code, class_type,
+#                           associated_class, class_number, delivery_method,
+#                           enrollment_capacity, enrollment_total,
+#                           [instructor, ...]], ...],
+#             "meetings": [section_index, days_mask, start_minutes,
+#                          end_minutes, location, campus, schedule_type, ...]
+#         }
+#     }
+# }
+#
+# Patch from "base" to "version" :
+# {
+#     "format": 1,
+#     "term": <string>,
+#     "base": <string>,
+#     "version": <string>,
+#     "strings_offset": <int (length of the base table)>,
+#     "strings": [<string (appended)>, ...],
+#     "departments": { <string (changed department)> : <dict (block)> },
+#     "removed": [<string (department)>, ...]
+# }
+#
+# The history of versions is saved next to the term snapshot (see
+# load_term_history), so patches still apply after a restart with a new
+# snapshot. Only what a patch needs from a base is kept: the final string
+# table, each version's table length and its department digests.
+
+import json, os, threading
+from collections import OrderedDict
+
+from controllers.term_store import days_mask, minutes
+
+BUNDLE_FORMAT = 1
+
+# Ints per meeting in a department's "meetings" list
+MEETING_WIDTH = 7
+
+
+class StringTable:
+    """
+    Append-only table mapping strings to their index.
+    """
+
+    def __init__(self, strings=()):
+        self.strings = list(strings)
+        self.index = {value: i for i, value in enumerate(self.strings)}
+
+    def ref(self, value) -> int:
+        if value is None:
+            return -1
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+
+
+def encode_department(courses: dict, table: StringTable, digest: str) -> dict:
+    """
+    Encode one department's { <course_number> : <Course> } into a block.
+    """
+
+    ref = table.ref
+    course_rows = []
+    section_rows = []
+    meetings = []
+
+    for course in courses.values():
+        course_index = len(course_rows)
+        course_rows.append(
+            [
+                ref(course.number),
+                ref(course.title),
+                ref(course.units),
+                ref(course.designation),
+            ]
+        )
+
+        for section in course.sections.values():
+            section_index = len(section_rows)
+            section_rows.append(
+                [
+                    course_index,
+                    ref(section.code),
+                    ref(section.section_code),
+                    ref(section.class_type),
+                    ref(section.associated_class),
+                    ref(section.class_number),
+                    ref(section.delivery_method),
+                    section.enrollment_capacity,
+                    section.enrollment_total,
+                    [ref(name) for name in section.instructors],
+                ]
+            )
+
+            for m in section.meeting_times:
+                meetings.extend(
+                    (
+                        section_index,
+                        days_mask(m.days),
+                        minutes(m.start_time),
+                        minutes(m.end_time),
+                        ref(m.location),
+                        ref(m.campus),
+                        ref(m.schedule_type),
+                    )
+                )
+
+    return {
+        "digest": digest,
+        "courses": course_rows,
+        "sections": section_rows,
+        "meetings": meetings,
+    }
+
+
+def history_file_name(term: str) -> str:
+    """
+    Bundle history file name for a term, e.g. "2025/spring" ->
+    "2025-spring.bundles.json"
+    """
+
+    return term.replace("/", "-") + ".bundles.json"
+
+
+class TermBundle:
+    """
+    One encoded version of a term.
+
+    A bundle loaded from a saved history only has the digest of each
+    department block (complete=False): it can be the base of a patch but
+    is never served itself.
+    """
+
+    def __init__(
+        self,
+        term: str,
+        version: str,
+        strings: list,
+        departments: dict,
+        complete: bool = True,
+    ):
+        self.term = term
+        self.version = version
+        self.strings = strings
+        # { <string (department)> : <dict (block)> }
+        self.departments = departments
+        self.complete = complete
+        # Serialized payloads, keyed by (<base version or None>, <mimetype>)
+        self.encoded = {}
+
+    def full(self) -> dict:
+        return {
+            "format": BUNDLE_FORMAT,
+            "term": self.term,
+            "version": self.version,
+            "strings": self.strings,
+            "departments": self.departments,
+        }
+
+    def patch_from(self, base: "TermBundle") -> dict:
+        return {
+            "format": BUNDLE_FORMAT,
+            "term": self.term,
+            "base": base.version,
+            "version": self.version,
+            "strings_offset": len(base.strings),
+            "strings": self.strings[len(base.strings) :],
+            "departments": {
+                dept: block
+                for dept, block in self.departments.items()
+                if dept not in base.departments
+                or base.departments[dept]["digest"] != block["digest"]
+            },
+            "removed": [
+                dept for dept in base.departments if dept not in self.departments
+            ],
+        }
+
+
+class BundleHistory:
+    """
+    Recent encoded versions of one term, newest last.
+
+    Each new version extends the previous version's string table and
+    reuses the blocks of departments whose digest did not change, so
+    patches can be served from any version still kept.
+    """
+
+    def __init__(self, max_versions: int = 8):
+        self.max_versions = max_versions
+        self.versions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def latest(self) -> TermBundle:
+        return next(reversed(self.versions.values()), None)
+
+    def get(self, version: str) -> TermBundle:
+        return self.versions.get(version)
+
+    def update(self, term) -> TermBundle:
+        """
+        Encode the current version of term (a term_store.Term) unless it
+        is already the latest, and return the latest bundle.
+        """
+
+        with self._lock:
+            latest = self.latest
+            if (
+                latest is not None
+                and latest.complete
+                and latest.version == term.version
+            ):
+                return latest
+
+            table = StringTable(latest.strings if latest is not None else ())
+            departments = {}
+            for dept, courses in term.departments.items():
+                digest = term.digest(dept)
+                previous = latest.departments.get(dept) if latest else None
+                if (
+                    previous is not None
+                    and latest.complete
+                    and previous["digest"] == digest
+                ):
+                    departments[dept] = previous
+                else:
+                    departments[dept] = encode_department(courses, table, digest)
+
+            bundle = TermBundle(term.name, term.version, table.strings, departments)
+            # A term can return to an earlier version; keep it ordered as newest
+            self.versions.pop(bundle.version, None)
+            self.versions[bundle.version] = bundle
+            while len(self.versions) > self.max_versions:
+                self.versions.popitem(last=False)
+            return bundle
+
+    def save(self, path: str):
+        """
+        Write what later patches need from the kept versions to path.
+        """
+
+        with self._lock:
+            latest = self.latest
+            data = {
+                "format": BUNDLE_FORMAT,
+                "term": latest.term,
+                "strings": latest.strings,
+                "versions": [
+                    {
+                        "version": bundle.version,
+                        "strings": len(bundle.strings),
+                        "digests": {
+                            dept: block["digest"]
+                            for dept, block in bundle.departments.items()
+                        },
+                    }
+                    for bundle in self.versions.values()
+                ],
+            }
+
+        # Write then rename, so a reader never sees a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, max_versions: int = 8) -> "BundleHistory":
+        """
+        Load a history written by save(); its versions can be patched from.
+        """
+
+        with open(path) as f:
+            data = json.load(f)
+
+        history = cls(max_versions)
+        if data.get("format") != BUNDLE_FORMAT:
+            return history
+        strings = data["strings"]
+        for entry in data["versions"][-max_versions:]:
+            history.versions[entry["version"]] = TermBundle(
+                data["term"],
+                entry["version"],
+                strings[: entry["strings"]],
+                {dept: {"digest": d} for dept, d in entry["digests"].items()},
+                complete=False,
+            )
+        return history
+
+
+def load_term_history(term, data_dir: str) -> BundleHistory:
+    """
+    Bundle history of term (a term_store.Term), loaded from data_dir and
+    extended with the term's current version. The history file is
+    rewritten when that version is new, so clients holding it can be sent
+    patches after the next snapshot.
+    """
+
+    path = os.path.join(data_dir, history_file_name(term.name))
+    history = BundleHistory()
+    if os.path.exists(path):
+        try:
+            history = BundleHistory.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[bundle] ignoring unreadable history {path}: {e!r}")
+
+    known = term.version in history.versions
+    history.update(term)
+    if not known:
+        try:
+            history.save(path)
+        except OSError as e:
+            print(f"[bundle] could not save history {path}: {e!r}")
+    return history
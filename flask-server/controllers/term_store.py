@@ -0,0 +1,433 @@
+# term_store.py
+
+# In-memory model for holding several terms of course data at once.
+# Every string is routed through one shared StringPool, so department codes,
+# instructor names, locations and titles are stored once no matter how many
+# terms reference them. Records use __slots__ to avoid a per-object __dict__.
+
+import hashlib, json, os, re
+
+# Bit per weekday for meeting-time day masks, e.g. "Mo, We" -> 0b101
+DAY_BITS = {"Mo": 1, "Tu": 2, "We": 4, "Th": 8, "Fr": 16, "Sa": 32, "Su": 64}
+DAY_PATTERN = re.compile("|".join(DAY_BITS))
+
+
+def term_file_name(term: str) -> str:
+    """
+    Snapshot file name for a term, e.g. "2025/spring" -> "2025-spring.json"
+    """
+
+    return term.replace("/", "-") + ".json"
+
+
+def days_mask(days: str) -> int:
+    """
+    Bitmask of the weekdays in a meetingTimes "days" value, e.g. "Mo, We"
+    """
+
+    mask = 0
+    for day in DAY_PATTERN.findall(days or ""):
+        mask |= DAY_BITS[day]
+    return mask
+
+
+def minutes(time: str) -> int:
+    """
+    Minutes since midnight of a "HH:MM" time, or -1 if it is missing
+    """
+
+    if not time:
+        return -1
+    hours, _, mins = time.partition(":")
+    return int(hours) * 60 + int(mins or 0)
+
+
+def content_digest(obj) -> str:
+    """
+    Short stable hash of a JSON-serializable value, used as a version/ETag.
+    """
+
+    data = json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+class StringPool:
+    """
+    Shared pool of interned values.
+
+    Equal strings passed to intern() come back as the same object, so
+    loading another term only costs memory for strings not seen before.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self):
+        self._values = {}
+
+    def intern(self, value):
+        if value is None:
+            return None
+        return self._values.setdefault(value, value)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class MeetingTime:
+    __slots__ = (
+        "days",
+        "start_time",
+        "end_time",
+        "location",
+        "campus",
+        "schedule_type",
+    )
+
+    def __init__(self, days, start_time, end_time, location, campus, schedule_type):
+        self.days = days
+        self.start_time = start_time
+        self.end_time = end_time
+        self.location = location
+        self.campus = campus
+        self.schedule_type = schedule_type
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Section:
+    __slots__ = (
+        "code",
+        "section_code",
+        "class_type",
+        "associated_class",
+        "title",
+        "class_number",
+        "delivery_method",
+        "enrollment_capacity",
+        "enrollment_total",
+        "instructors",
+        "meeting_times",
+    )
+
+    def __init__(self, code, section_code, class_type, associated_class, title):
+        self.code = code
+        self.section_code = section_code
+        self.class_type = class_type
+        self.associated_class = associated_class
+        self.title = title
+        self.class_number = None
+        self.delivery_method = None
+        self.enrollment_capacity = None
+        self.enrollment_total = None
+        self.instructors = ()
+        self.meeting_times = ()
+
+    def to_dict(self) -> dict:
+        section = {name: getattr(self, name) for name in self.__slots__}
+        section["instructors"] = list(self.instructors)
+        section["meeting_times"] = [m.to_dict() for m in self.meeting_times]
+        return section
+
+
+class Course:
+    __slots__ = ("dept_code", "number", "title", "units", "designation", "sections")
+
+    def __init__(self, dept_code, number, title=None):
+        self.dept_code = dept_code
+        self.number = number
+        self.title = title
+        self.units = None
+        self.designation = None
+        # { <string (section code)> : <Section> }
+        self.sections = {}
+
+    def to_dict(self) -> dict:
+        course = {name: getattr(self, name) for name in self.__slots__}
+        course["sections"] = [s.to_dict() for s in self.sections.values()]
+        return course
+
+
+class Term:
+    __slots__ = ("name", "departments", "_digests")
+
+    def __init__(self, name):
+        self.name = name
+        # { <string (department)> : { <string (course_number)> : <Course> } }
+        self.departments = {}
+        # Memoized content digests, keyed by (dept, course, section) path
+        self._digests = {}
+
+    def invalidate(self):
+        """
+        Drop memoized digests; call after changing the term's data.
+        """
+
+        self._digests.clear()
+
+    def digest(self, dept: str = None, course: str = None, section: str = None):
+        """
+        Content digest of the whole term, a department, a course or a
+        section, or None if it does not exist. A department's digest only
+        changes when that department's data changes, and the term's
+        digest is built from its departments' digests.
+        """
+
+        key = tuple(part and part.upper() for part in (dept, course, section))
+        if key in self._digests:
+            return self._digests[key]
+
+        if dept is None:
+            value = content_digest(
+                {d: self.digest(d) for d in sorted(self.departments)}
+            )
+        elif course is None:
+            courses = self.departments.get(key[0])
+            value = None
+            if courses is not None:
+                value = content_digest([c.to_dict() for c in courses.values()])
+        elif section is None:
+            course_obj = self.get_course(dept, course)
+            value = None if course_obj is None else content_digest(course_obj.to_dict())
+        else:
+            section_obj = self.get_section(dept, course, section)
+            value = (
+                None if section_obj is None else content_digest(section_obj.to_dict())
+            )
+
+        # Misses are not memoized, so unknown paths cannot grow the cache
+        if value is not None:
+            self._digests[key] = value
+        return value
+
+    @property
+    def version(self) -> str:
+        """
+        Version of the term's data as of the last sync; changes whenever
+        any department does.
+        """
+
+        return self.digest()
+
+    def get_course(self, dept: str, course: str):
+        return self.departments.get(dept.upper(), {}).get(course.upper())
+
+    def get_section(self, dept: str, course: str, section: str):
+        course_obj = self.get_course(dept, course)
+        if course_obj is None:
+            return None
+        return course_obj.sections.get(section.upper())
+
+    def iter_sections(self):
+        for courses in self.departments.values():
+            for course in courses.values():
+                yield from course.sections.values()
+
+
+class TermCatalog:
+    """
+    Holds any number of terms side by side, keyed by term
+    (e.g. "2025/spring"), all sharing one StringPool.
+    """
+
+    def __init__(self, pool: StringPool = None):
+        self.pool = pool if pool is not None else StringPool()
+        self.terms = {}
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.terms
+
+    def get_term(self, term: str) -> Term:
+        return self.terms.get(term)
+
+    def unload_term(self, term: str):
+        self.terms.pop(term, None)
+
+    def dump_term(self, term: str) -> dict:
+        """
+        Plain dict snapshot of a loaded term, in form :
+        {
+            "term": <string>,
+            "departments": {
+                <string (department)> : [
+                    <dict (see Course.to_dict) >
+                ]
+            }
+        }
+        """
+
+        term_obj = self.terms[term]
+        return {
+            "term": term_obj.name,
+            "departments": {
+                dept: [course.to_dict() for course in courses.values()]
+                for dept, courses in term_obj.departments.items()
+            },
+        }
+
+    def load_snapshot(self, snapshot: dict) -> Term:
+        """
+        Load a term from the output of dump_term(), replacing any
+        previously loaded data for the same term.
+        """
+
+        intern = self.pool.intern
+        term_obj = Term(intern(snapshot["term"]))
+
+        for dept, courses in snapshot["departments"].items():
+            dept = intern(dept)
+            dept_courses = {}
+            for c in courses:
+                course = Course(dept, intern(c["number"]), intern(c["title"]))
+                course.units = intern(c["units"])
+                course.designation = intern(c["designation"])
+
+                for s in c["sections"]:
+                    section = Section(
+                        intern(s["code"]),
+                        intern(s["section_code"]),
+                        intern(s["class_type"]),
+                        intern(s["associated_class"]),
+                        intern(s["title"]),
+                    )
+                    section.class_number = intern(s["class_number"])
+                    section.delivery_method = intern(s["delivery_method"])
+                    section.enrollment_capacity = s["enrollment_capacity"]
+                    section.enrollment_total = s["enrollment_total"]
+                    section.instructors = tuple(intern(i) for i in s["instructors"])
+                    section.meeting_times = tuple(
+                        MeetingTime(
+                            *(intern(m[name]) for name in MeetingTime.__slots__)
+                        )
+                        for m in s["meeting_times"]
+                    )
+                    course.sections[section.code] = section
+
+                dept_courses[course.number] = course
+            term_obj.departments[dept] = dept_courses
+
+        self.terms[term_obj.name] = term_obj
+        return term_obj
+
+    def remove_department(self, term: str, dept: str):
+        term_obj = self.terms.get(term)
+        if term_obj is not None and term_obj.departments.pop(dept.upper(), None):
+            term_obj.invalidate()
+
+    def save_term_file(self, term: str, data_dir: str) -> str:
+        path = os.path.join(data_dir, term_file_name(term))
+        # Write then rename, so a starting server never reads a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.dump_term(term), f)
+        os.replace(tmp_path, path)
+        return path
+
+    def load_term_file(self, path: str) -> Term:
+        with open(path) as f:
+            return self.load_snapshot(json.load(f))
+
+    def load_term(self, term: str, course_sections: dict) -> Term:
+        """
+        Load the output of SFUCoursesAPI.get_course_sections() for a term.
+
+        course_sections is in form :
+        {
+            <string (department)> : {
+                <string (course_number)> : {
+                    <string (associated_class)> : [
+                        <dict (section) >
+                    ]
+                }
+            }
+        }
+
+        Replaces any previously loaded data for the same term.
+        """
+
+        intern = self.pool.intern
+        term_obj = Term(intern(term))
+
+        for dept, courses in course_sections.items():
+            dept = intern(dept.upper())
+            dept_courses = {}
+
+            for course_number, grouped_sections in courses.items():
+                course = Course(dept, intern(course_number.upper()))
+
+                for sections in grouped_sections.values():
+                    for section in sections:
+                        code = intern(section["text"].upper())
+                        course.sections[code] = Section(
+                            code,
+                            intern(section.get("sectionCode")),
+                            intern(section.get("classType")),
+                            intern(section.get("associatedClass")),
+                            intern(section.get("title")),
+                        )
+                        if course.title is None:
+                            course.title = intern(section.get("title"))
+
+                dept_courses[course.number] = course
+            term_obj.departments[dept] = dept_courses
+
+        self.terms[term_obj.name] = term_obj
+        return term_obj
+
+    def add_section_info(
+        self, term: str, dept: str, course: str, section: str, section_info: dict
+    ) -> Section:
+        """
+        Fold the detailed response of SFUCoursesAPI.get_section_info()
+        into an already loaded section, creating it if it is missing.
+        """
+
+        intern = self.pool.intern
+        term_obj = self.terms.get(term)
+        if term_obj is None:
+            term_obj = self.terms[intern(term)] = Term(intern(term))
+        term_obj.invalidate()
+
+        dept = intern(dept.upper())
+        course_key = intern(course.upper())
+        course_obj = term_obj.departments.setdefault(dept, {}).get(course_key)
+        if course_obj is None:
+            course_obj = Course(dept, course_key)
+            term_obj.departments[dept][course_key] = course_obj
+
+        code = intern(section.upper())
+        section_obj = course_obj.sections.get(code)
+        if section_obj is None:
+            section_obj = Section(
+                code,
+                None,
+                None,
+                intern(section_info.get("associatedClass")),
+                intern(section_info.get("title")),
+            )
+            course_obj.sections[code] = section_obj
+
+        course_obj.title = intern(section_info.get("title")) or course_obj.title
+        course_obj.units = intern(section_info.get("units"))
+        course_obj.designation = intern(section_info.get("designation"))
+
+        section_obj.class_number = intern(section_info.get("classNumber"))
+        section_obj.delivery_method = intern(section_info.get("deliveryMethod"))
+        section_obj.enrollment_capacity = section_info.get("enrollmentCapacity")
+        section_obj.enrollment_total = section_info.get("enrollmentTotal")
+        section_obj.instructors = tuple(
+            intern(i.get("name") if isinstance(i, dict) else i)
+            for i in section_info.get("instructor", [])
+        )
+        section_obj.meeting_times = tuple(
+            MeetingTime(
+                intern(m.get("days")),
+                intern(m.get("startTime")),
+                intern(m.get("endTime")),
+                intern(m.get("location")),
+                intern(m.get("campus")),
+                intern(m.get("scheduleType")),
+            )
+            for m in section_info.get("meetingTimes", [])
+        )
+        return section_obj
@@ -1,8 +1,9 @@
 # Logic for extracting transcript text
 
-import pdfplumber
 import re, json
 
+from controllers.profiling import profiled
+
 laparams_settings = {
     "line_overlap": 0.3,  # Controls how much overlap is considered a single line
     "char_margin": 0.5,  # Merges characters into words if they are close
@@ -11,30 +12,53 @@ laparams_settings = {
     "boxes_flow": 1,  # Controls the detection of text columns
 }
 
-with pdfplumber.open("UT.pdf", laparams=laparams_settings) as pdf:
+
+def extract_transcript_lines(pdf_file) -> tuple:
+    """
+    Extract the course lines and major from an unofficial transcript PDF.
+
+    Args:
+        pdf_file: Path or binary file object of the transcript PDF
+
+    Returns a tuple in form :
+    ([<string (course line)>, ...], <string (major)> or None)
+
+    Raises ValueError if pdf_file is not a readable PDF.
+    """
+
+    # Imported here so that importing this module stays cheap
+    import pdfplumber
+    from pdfplumber.utils.exceptions import PdfminerException
+
+    try:
+        return _extract_lines(pdfplumber.open(pdf_file, laparams=laparams_settings))
+    except PdfminerException as e:
+        raise ValueError(f"Could not read the transcript PDF: {e}") from e
+
+
+def _extract_lines(pdf) -> tuple:
     text = []
+    major = None
     start_of_courses = False
 
-    for page in pdf.pages:
-        for line in page.extract_text_lines():
-
-            # Find which major
-            if line["text"].strip().startswith("Major in "):
-                major = line["text"]
+    with pdf:
+        for page in pdf.pages:
+            for line in page.extract_text_lines():
 
-            # Find which lines are courses
-            if line["text"].strip().startswith("Attempted"):
-                start_of_courses = True
-                continue
-            elif start_of_courses and line["text"].startswith("Term"):
-                start_of_courses = False
-            if line["text"] and start_of_courses and len(line["text"]) > 3:
-                text.append(line["text"])
+                # Find which major
+                if line["text"].strip().startswith("Major in "):
+                    major = line["text"]
 
-    courses = "\n".join(text)
+                # Find which lines are courses
+                if line["text"].strip().startswith("Attempted"):
+                    start_of_courses = True
+                    continue
+                elif start_of_courses and line["text"].startswith("Term"):
+                    start_of_courses = False
+                if line["text"] and start_of_courses and len(line["text"]) > 3:
+                    text.append(line["text"])
 
-# print(courses)
-# print(major)
+    return text, major
 
 
 def parse_course_data(text_list: list) -> dict:
@@ -82,7 +106,6 @@ def parse_course_data(text_list: list) -> dict:
             grade, grade_points, class_average, class_enrollment = rest
 
         # Populate dictionary
-        print(course_list, class_enrollment, grade_points)
         course_dict[key] = {
             "course_department": course_department,
             "course_number": course_number,
@@ -118,10 +141,25 @@ def extract_course_info(s):
     return final_course_list
 
 
-course_data_dict = parse_course_data(text)
+@profiled
+def parse_transcript(pdf_file) -> dict:
+    """
+    Parse a transcript PDF into its major and the courses taken.
+
+    Returns a dict in form :
+    {
+        "major": <string> or None,
+        "courses": <dict (see parse_course_data)>
+    }
+    """
+
+    text, major = extract_transcript_lines(pdf_file)
+    return {"major": major, "courses": parse_course_data(text)}
+
 
-# Convert Python to JSON
-json_object = json.dumps(course_data_dict, indent=4)
+if __name__ == "__main__":
+    # Convert Python to JSON
+    json_object = json.dumps(parse_transcript("UT.pdf"), indent=4)
 
-# Print JSON object
-print(json_object)
+    # Print JSON object
+    print(json_object)
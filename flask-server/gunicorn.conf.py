@@ -0,0 +1,38 @@
+# gunicorn.conf.py
+
+# Production serving profile. Run from flask-server/ :
+#     PRELOAD_TERMS=2025/spring gunicorn -c gunicorn.conf.py
+
+import gc, multiprocessing, os
+
+# Seat polling and its event streams run in one separate process (see
+# gunicorn_seats.conf.py); route /seats/ there from the reverse proxy.
+os.environ.setdefault("SERVE_SEATS", "0")
+
+wsgi_app = "wsgi:app"
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Course endpoints are CPU-bound JSON work on in-memory data, so scale
+# processes with cores and keep a few threads each for slow clients and
+# the live SFU API fallback.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Load the app (and the preloaded term data) once in the master, so forked
+# workers share those pages copy-on-write instead of each holding a copy.
+preload_app = True
+
+keepalive = 5
+timeout = 30
+graceful_timeout = 10
+
+# Recycle workers now and then; restarts are a cheap fork of the master
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter = 500
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the garbage collector's view, so
+    # collections in workers do not write to (and un-share) the shared pages.
+    gc.freeze()
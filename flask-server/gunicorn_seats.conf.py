@@ -0,0 +1,35 @@
+# gunicorn_seats.conf.py
+
+# Serving profile for the /seats routes (routes/seats.py). Run from
+# flask-server/ next to the main profile, and route /seats/ here from the
+# reverse proxy :
+#     gunicorn -c gunicorn_seats.conf.py
+#
+# Seat counts are polled by a SeatTracker held in memory, so everything runs
+# in a single worker: every watcher of a section shares one poll, and the
+# recorded series are not split across processes.
+
+import os
+
+wsgi_app = "wsgi:app"
+bind = os.getenv("SEATS_BIND", "0.0.0.0:8001")
+
+os.environ["SERVE_SEATS"] = "1"
+# The seat routes do not read term snapshots
+os.environ["PRELOAD_TERMS"] = ""
+
+workers = 1
+# Each open event stream holds a thread for as long as the client stays
+# connected (streams only wake for events and heartbeats), so size the
+# pool for the number of concurrent subscribers rather than for CPU.
+worker_class = "gthread"
+threads = int(os.getenv("SEAT_STREAM_THREADS", 512))
+
+# Streams outlive any request timeout; gthread only uses timeout to detect
+# a hung worker, which the main thread keeps reporting on.
+timeout = 30
+graceful_timeout = 10
+keepalive = 5
+
+# Recycling the worker would drop the in-memory seat series
+max_requests = 0
@@ -1 +1,207 @@
 # Routes for fetching course data
+
+from flask import Blueprint, current_app, jsonify, request
+
+from controllers.free_time import SectionIndex, parse_search_request
+from controllers.sfu_api import SFUCoursesAPI
+from controllers.term_bundle import BundleHistory
+from serving import conditional_json, conditional_response, pack, preferred_packing
+
+course_bp = Blueprint("course", __name__, url_prefix="/courses")
+
+
+def get_term(year: str, semester: str):
+    """
+    Preloaded Term for <year>/<semester>, or None if it is not loaded.
+    """
+
+    return current_app.extensions["term_catalog"].get_term(f"{year}/{semester}")
+
+
+def term_not_loaded(year: str, semester: str):
+    return jsonify({"error": f"Term {year}/{semester} is not loaded"}), 404
+
+
+@course_bp.get("/<year>/<semester>")
+def get_departments(year: str, semester: str):
+    """
+    List departments offering courses in the given term.
+    """
+
+    term = get_term(year, semester)
+    if term is not None:
+        return conditional_json(term.version, lambda: sorted(term.departments))
+
+    departments = SFUCoursesAPI(f"{year}/{semester}").get_departments()
+    if isinstance(departments, dict):
+        return jsonify(departments), 502
+    return jsonify(departments)
+
+
+@course_bp.get("/<year>/<semester>/manifest")
+def get_manifest(year: str, semester: str):
+    """
+    Current version of the term and ETag of each department, so a client
+    can refresh only the departments whose ETag changed.
+
+    Returns in form :
+    {
+        "term": <string>,
+        "version": <string>,
+        "departments": { <string (department)> : <string (etag)> }
+    }
+    """
+
+    term = get_term(year, semester)
+    if term is None:
+        return term_not_loaded(year, semester)
+
+    return conditional_json(
+        term.version,
+        lambda: {
+            "term": term.name,
+            "version": term.version,
+            "departments": {dept: term.digest(dept) for dept in term.departments},
+        },
+    )
+
+
+@course_bp.get("/<year>/<semester>/bundle")
+def get_bundle(year: str, semester: str):
+    """
+    Compact encoding of the whole term for the frontend (see term_bundle.py).
+
+    With ?since=<version> of a version the server still keeps, returns a
+    patch from that version instead of the full bundle; an empty patch if
+    it is the current version. Served as
+    MessagePack when the client accepts application/msgpack, JSON otherwise.
+    """
+
+    term = get_term(year, semester)
+    if term is None:
+        return term_not_loaded(year, semester)
+
+    bundles = current_app.extensions["term_bundles"]
+    history = bundles.get(term.name)
+    if history is None:
+        history = bundles.setdefault(term.name, BundleHistory())
+    bundle = history.update(term)
+
+    base = history.get(request.args.get("since"))
+    mimetype = preferred_packing()
+    etag = bundle.version if base is None else f"{base.version}..{bundle.version}"
+
+    def build():
+        key = (base and base.version, mimetype)
+        data = bundle.encoded.get(key)
+        if data is None:
+            payload = bundle.full() if base is None else bundle.patch_from(base)
+            data = bundle.encoded[key] = pack(payload, mimetype)
+        return current_app.response_class(data, mimetype=mimetype)
+
+    response = conditional_response(f"{etag}-{mimetype.split('/')[-1]}", build)
+    response.vary.add("Accept")
+    return response
+
+
+@course_bp.post("/<year>/<semester>/free-time")
+def search_free_time(year: str, semester: str):
+    """
+    Sections that fit into the gaps of an existing timetable.
+
+    Request body :
+    {
+        "busy": [{"days": "Mo, We", "start": "10:30", "end": "11:20"}, ...],
+        "sections": ["CMPT/225/D100", ...],
+        "filters": {
+            "departments": [<string>, ...],
+            "designation": <string>,
+            "campus": <string>,
+            "units": [<string>, ...],
+            "include_unscheduled": <bool>
+        },
+        "limit": <int>
+    }
+
+    Returns the compatible sections ranked, see SectionIndex.search, or a
+    400 for a malformed body.
+    """
+
+    term = get_term(year, semester)
+    if term is None:
+        return term_not_loaded(year, semester)
+
+    # An empty body searches with the defaults; anything else must be JSON
+    body = {}
+    if request.get_data():
+        body = request.get_json(force=True, silent=True)
+        if body is None:
+            return jsonify({"error": "Request body must be valid JSON"}), 400
+    try:
+        occupied, search = parse_search_request(term, body)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    indexes = current_app.extensions["section_indexes"]
+    index = indexes.get(term.name)
+    if index is None or index.version != term.version:
+        index = indexes[term.name] = SectionIndex(term)
+
+    return jsonify(index.search(occupied, **search))
+
+
+@course_bp.get("/<year>/<semester>/<dept>")
+def get_department_courses(year: str, semester: str, dept: str):
+    """
+    All courses (with their sections) for a department in the given term.
+    """
+
+    term = get_term(year, semester)
+    if term is None:
+        return term_not_loaded(year, semester)
+
+    etag = term.digest(dept)
+    if etag is None:
+        return jsonify({"error": "Department not found"}), 404
+
+    courses = term.departments[dept.upper()]
+    return conditional_json(
+        etag, lambda: [course.to_dict() for course in courses.values()]
+    )
+
+
+@course_bp.get("/<year>/<semester>/<dept>/<course>")
+def get_course(year: str, semester: str, dept: str, course: str):
+    """
+    A single course with its sections.
+    """
+
+    term = get_term(year, semester)
+    if term is None:
+        return term_not_loaded(year, semester)
+
+    etag = term.digest(dept, course)
+    if etag is None:
+        return jsonify({"error": "Course not found"}), 404
+    return conditional_json(etag, term.get_course(dept, course).to_dict)
+
+
+@course_bp.get("/<year>/<semester>/<dept>/<course>/<section>")
+def get_section(year: str, semester: str, dept: str, course: str, section: str):
+    """
+    Detailed info for a single course section.
+    """
+
+    term = get_term(year, semester)
+    if term is not None:
+        etag = term.digest(dept, course, section)
+        if etag is None:
+            return jsonify({"error": "Section not found"}), 404
+        return conditional_json(etag, term.get_section(dept, course, section).to_dict)
+
+    section_info = SFUCoursesAPI(f"{year}/{semester}").get_section_info(
+        dept, course, section
+    )
+    if not section_info:
+        return jsonify({"error": "Section not found"}), 404
+    return jsonify(section_info)
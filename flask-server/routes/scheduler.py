@@ -1 +1,15 @@
 # Routes for running scheduling algorithm
+
+from flask import Blueprint, jsonify
+
+scheduler_bp = Blueprint("scheduler", __name__, url_prefix="/schedules")
+
+
+@scheduler_bp.post("/generate")
+def generate_schedule():
+    """
+    Accepts constraints and generates a schedule.
+    """
+
+    # Scheduling algorithm lives in controllers/scheduler_controller.py
+    return jsonify({"error": "Schedule generation is not implemented yet"}), 501
@@ -0,0 +1,118 @@
+# Routes for live seat availability
+
+import json, queue, re
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
+
+from controllers.seat_tracker import SeatTracker, section_key
+
+seats_bp = Blueprint("seats", __name__, url_prefix="/seats")
+
+# Each term gets a long-lived tracker, so only real terms may create one
+TERM_PATTERN = re.compile(r"\d{4}/(spring|summer|fall)")
+
+
+def get_tracker(year: str, semester: str) -> SeatTracker:
+    """
+    SeatTracker of <year>/<semester>, or None if that is not a valid term.
+    """
+
+    term = f"{year}/{semester}".lower()
+    if not TERM_PATTERN.fullmatch(term):
+        return None
+    trackers = current_app.extensions["seat_trackers"]
+    tracker = trackers.get(term)
+    if tracker is None:
+        tracker = trackers.setdefault(
+            term,
+            SeatTracker(
+                term,
+                interval=current_app.config["SEAT_POLL_INTERVAL"],
+                api_url=current_app.config["SFU_API_URL"],
+            ),
+        )
+    return tracker
+
+
+def unknown_term(year: str, semester: str):
+    return jsonify({"error": f"Unknown term {year}/{semester}"}), 404
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@seats_bp.get("/<year>/<semester>/stream")
+def stream_seats(year: str, semester: str):
+    """
+    Server-sent events with the enrolment counts of the given sections,
+    e.g. ?sections=CMPT/225/D100,MATH/151/D100
+
+    Sends the latest known counts on connect, then a "seats" event each
+    time a section's counts change. Sections are only polled while
+    someone is watching them.
+    """
+
+    keys = {
+        section_key(*key.split("/"))
+        for key in request.args.get("sections", "").split(",")
+        if key.count("/") == 2
+    }
+    if not keys:
+        return jsonify({"error": "Pass sections=<dept>/<course>/<section>,..."}), 400
+    if len(keys) > current_app.config["SEAT_MAX_SECTIONS"]:
+        return jsonify({"error": "Too many sections"}), 400
+
+    tracker = get_tracker(year, semester)
+    if tracker is None:
+        return unknown_term(year, semester)
+    heartbeat = current_app.config["SEAT_HEARTBEAT"]
+    events = tracker.subscribe(keys)
+
+    def stream():
+        try:
+            for key in sorted(keys):
+                latest = tracker.latest(key)
+                if latest is not None:
+                    yield sse("seats", dict(section=key, **latest))
+            while True:
+                try:
+                    event = events.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse("seats", event)
+        finally:
+            tracker.unsubscribe(events)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@seats_bp.get("/<year>/<semester>/<dept>/<course>/<section>")
+def get_seats(year: str, semester: str, dept: str, course: str, section: str):
+    """
+    Latest counts and recorded history of a watched section.
+    """
+
+    tracker = get_tracker(year, semester)
+    if tracker is None:
+        return unknown_term(year, semester)
+    key = section_key(dept, course, section)
+    series = tracker.series.get(key)
+    if series is None:
+        return jsonify({"error": "Section is not being watched"}), 404
+    return jsonify(
+        {"section": key, "latest": series.latest(), "history": series.to_dict()}
+    )
@@ -0,0 +1,35 @@
+# snapshot_term.py
+
+# Crawl a term from the SFU course outlines API and save it as a JSON
+# snapshot that the server can preload (see PRELOAD_TERMS in server.py).
+# The term's bundle history is extended alongside it, so frontend clients
+# on an earlier snapshot get a patch rather than the full bundle.
+#
+# Run from flask-server/ :
+#     python -m scripts.snapshot_term 2025/spring [--data-dir data]
+
+import argparse, os
+
+from controllers.sfu_api import SFUCoursesAPI
+from controllers.term_bundle import load_term_history
+from controllers.term_store import TermCatalog
+from server import DEFAULT_TERM_DATA_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save a term snapshot")
+    parser.add_argument(
+        "term", help='Term in form <year>/<semester>, e.g. "2025/spring"'
+    )
+    parser.add_argument("--data-dir", default=DEFAULT_TERM_DATA_DIR)
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    catalog = TermCatalog()
+    term = SFUCoursesAPI(args.term).crawl_term(catalog)
+    print(catalog.save_term_file(args.term, args.data_dir))
+    load_term_history(term, args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
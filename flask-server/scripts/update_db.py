@@ -0,0 +1,66 @@
+# update_db.py
+
+# Sync a term from the SFU course outlines API into Supabase, on a schedule
+# that adapts to the term's phase (see controllers/sync_scheduler.py).
+# Each run also updates the term snapshot the server preloads, unless
+# --no-snapshot is given.
+#
+# Run from flask-server/ :
+#     python -m scripts.update_db 2025/fall          # keep syncing
+#     python -m scripts.update_db 2025/fall --once   # sync once and exit
+
+import argparse, os
+
+from controllers.sync_scheduler import DEFAULT_FULL_SYNC_EVERY, SyncScheduler
+from server import DEFAULT_TERM_DATA_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync a term into Supabase")
+    parser.add_argument("term", help='Term in form <year>/<semester>, e.g. "2025/fall"')
+    parser.add_argument("--once", action="store_true", help="Run a single sync")
+    parser.add_argument(
+        "--metrics",
+        default=os.path.join(DEFAULT_TERM_DATA_DIR, "sync_metrics.jsonl"),
+        help="JSON lines file each run's metrics are appended to",
+    )
+    parser.add_argument(
+        "--lock",
+        default=os.path.join(DEFAULT_TERM_DATA_DIR, "sync.lock"),
+        help="Lock file keeping syncs single-flight across processes",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=DEFAULT_TERM_DATA_DIR,
+        help="Directory of the term snapshot and bundle history to update",
+    )
+    parser.add_argument(
+        "--full-every",
+        type=int,
+        default=DEFAULT_FULL_SYNC_EVERY,
+        help="Sync every department every this many runs, only recently "
+        "changed ones in between (1 = always sync everything)",
+    )
+    parser.add_argument("--no-snapshot", action="store_true", help="Only sync Supabase")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.lock) or ".", exist_ok=True)
+    try:
+        scheduler = SyncScheduler(
+            args.term,
+            metrics_path=args.metrics,
+            lock_path=args.lock,
+            data_dir=None if args.no_snapshot else args.data_dir,
+            full_sync_every=args.full_every,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if args.once:
+        if scheduler.run_once() is None:
+            print("[sync] another sync is already running, skipped")
+    else:
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
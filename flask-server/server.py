@@ -1,26 +1,132 @@
 """
 server.py
 
-This module defines API routes for the Schedule Builder backend. 
+This module defines the Flask app factory for the Schedule Builder backend.
 
 It handles:
-- Receiving user constraints via POST requests and generating schedules.
-- Returning generated schedules via GET requests.
+- Registering the blueprints from routes/.
+- Returning course data, served from preloaded term snapshots when
+  available and fetched from the SFU course outlines API otherwise.
+- Parsing uploaded transcripts.
 
-Flask is used as the backend framework.
+Flask is used as the backend framework. Heavy dependencies (pdfplumber,
+supabase, dotenv) are imported lazily on first use, so creating the app
+is cheap and gunicorn worker restarts stay fast. See gunicorn.conf.py and
+wsgi.py for the production serving profile.
+
+Course data served from preloaded terms carries strong ETags derived from
+the synced data and honours If-None-Match (see serving.conditional_json).
+Snapshots are written by scripts/snapshot_term.py and by each database
+sync (scripts/update_db.py), and read once at startup: a worker keeps
+serving the version it loaded until the server is restarted.
+
+Requests can be profiled on demand, see controllers/profiling.py.
 
 Endpoints:
-- POST /generate_schedule: Accepts constraints and generates a schedule.
-- GET /get_schedule/<schedule_id>: Returns a schedule by ID.
-- GET /get_courses/<
+- GET /courses/<year>/<semester>: Returns departments for a term.
+- GET /courses/<year>/<semester>/manifest: Returns per-department ETags.
+- GET /courses/<year>/<semester>/bundle: Returns the compact term bundle,
+  or a patch from ?since=<version>.
+- POST /courses/<year>/<semester>/free-time: Returns sections that fit
+  around an existing timetable.
+- GET /courses/<year>/<semester>/<dept>: Returns a department's courses.
+- GET /courses/<year>/<semester>/<dept>/<course>: Returns a course.
+- GET /courses/<year>/<semester>/<dept>/<course>/<section>: Returns a section.
+- GET /seats/<year>/<semester>/stream?sections=...: Streams seat counts (SSE).
+- GET /seats/<year>/<semester>/<dept>/<course>/<section>: Returns seat history.
+- POST /schedules/generate: Accepts constraints and generates a schedule.
+- POST /transcript: Parses an uploaded transcript PDF.
 """
 
+import os
+
 from flask import Flask
 
-app = Flask(__name__)
+# Where scripts/snapshot_term.py writes term snapshots
+DEFAULT_TERM_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def create_app(config: dict = None) -> Flask:
+    """
+    Build the Flask app and register its blueprints.
+
+    Args:
+        config (dict): Extra Flask config values to apply
+
+    Config:
+        TERM_DATA_DIR (str): Directory holding term snapshots
+        PRELOAD_TERMS (list): Terms to load from TERM_DATA_DIR at startup,
+            e.g. ["2025/spring"]. Defaults to the comma separated
+            PRELOAD_TERMS environment variable.
+        SERVE_SEATS (bool): Register the /seats routes. Defaults to the
+            SERVE_SEATS environment variable, on unless "0"; the production
+            profile serves them from one dedicated process instead
+            (see gunicorn_seats.conf.py).
+        SEAT_POLL_INTERVAL (float): Seconds between seat count polls
+        SFU_API_URL (str): Course outlines API the seat tracker polls
+            (None = the live SFU API)
+    """
+
+    app = Flask(__name__)
+    app.config["TERM_DATA_DIR"] = os.getenv("TERM_DATA_DIR", DEFAULT_TERM_DATA_DIR)
+    app.config["PRELOAD_TERMS"] = [
+        term for term in os.getenv("PRELOAD_TERMS", "").split(",") if term
+    ]
+    app.config["SERVE_SEATS"] = os.getenv("SERVE_SEATS", "1") != "0"
+    app.config["SEAT_POLL_INTERVAL"] = float(os.getenv("SEAT_POLL_INTERVAL", 30))
+    app.config["SFU_API_URL"] = os.getenv("SFU_API_URL")
+    app.config["SEAT_HEARTBEAT"] = 15
+    app.config["SEAT_MAX_SECTIONS"] = 200
+    if config:
+        app.config.update(config)
+
+    from serving import init_serving
+    from controllers.profiling import init_profiling
+    from controllers.term_store import TermCatalog, term_file_name
+    from controllers.term_bundle import load_term_history
+    from controllers.free_time import SectionIndex
+
+    init_serving(app)
+    init_profiling(app)
+
+    # Read-only after startup, so gunicorn workers share it copy-on-write
+    catalog = TermCatalog()
+    bundles = {}
+    section_indexes = {}
+    for term in app.config["PRELOAD_TERMS"]:
+        term_obj = catalog.load_term_file(
+            os.path.join(app.config["TERM_DATA_DIR"], term_file_name(term))
+        )
+        # Compute the ETags, frontend bundle and free time index before
+        # workers fork
+        term_obj.version
+        bundles[term_obj.name] = load_term_history(
+            term_obj, app.config["TERM_DATA_DIR"]
+        )
+        section_indexes[term_obj.name] = SectionIndex(term_obj)
+    app.extensions["term_catalog"] = catalog
+    app.extensions["term_bundles"] = bundles
+    app.extensions["section_indexes"] = section_indexes
+    app.extensions["seat_trackers"] = {}
+
+    from routes.course import course_bp
+    from routes.scheduler import scheduler_bp
+    from routes.seats import seats_bp
+    from routes.transcript import transcript_bp
+
+    app.register_blueprint(course_bp)
+    app.register_blueprint(scheduler_bp)
+    if app.config["SERVE_SEATS"]:
+        app.register_blueprint(seats_bp)
+    app.register_blueprint(transcript_bp)
+
+    # Routes
+    @app.route("/")
+    def index():
+        return {"status": "ok"}
+
+    return app
 
 
-# Routes
-@app.route("/")
-def index():
-    return
+if __name__ == "__main__":
+    create_app().run(debug=True)
@@ -0,0 +1,193 @@
+"""
+serving.py
+
+Production serving helpers for the Flask app:
+- A JSON provider backed by orjson when it is installed.
+- gzip / brotli compression of large JSON responses.
+- Conditional responses with strong ETags and Cache-Control.
+- MessagePack bodies for clients that ask for them, when msgpack is installed.
+
+The JSON provider and compression are installed on the app by init_serving(), called from create_app().
+"""
+
+import gzip, json
+
+from flask import Flask, current_app, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+COMPRESSIBLE_MIMETYPES = {JSON_MIMETYPE, MSGPACK_MIMETYPE}
+
+# A strong ETag must differ per content-coding, so compressed responses get
+# the coding appended to their ETag, e.g. "3f2a..." -> "3f2a...-gzip"
+ETAG_ENCODING_SUFFIXES = ("", "-gzip", "-br")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Serializes with orjson when available, falling back to the
+    standard library json module otherwise.
+    """
+
+    # Sorting keys costs time on every response and clients do not need it
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(
+            obj, default=self.default, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        # Hand orjson's bytes straight to the response, skipping a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS),
+            mimetype=self.mimetype,
+        )
+
+
+def compress_response(response):
+    """
+    after_request hook that compresses JSON bodies of at least
+    COMPRESS_MIN_SIZE bytes with brotli or gzip, whichever the client
+    prefers and is available.
+    """
+
+    if (
+        response.direct_passthrough
+        or response.status_code < 200
+        or response.status_code >= 300
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    data = response.get_data()
+    if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    encoding = request.accept_encodings.best_match(offered)
+    if encoding == "br":
+        data = brotli.compress(data, quality=current_app.config["COMPRESS_BR_LEVEL"])
+    elif encoding == "gzip":
+        data = gzip.compress(data, compresslevel=current_app.config["COMPRESS_LEVEL"])
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def conditional_response(etag: str, build):
+    """
+    Response for a cacheable resource identified by etag.
+
+    Replies 304 Not Modified when the request's If-None-Match already
+    holds this etag (in any content-coding, compared weakly as RFC 7232
+    requires for If-None-Match), so build() is only called,
+    and the body only serialized, when the client needs it.
+
+    Args:
+        etag (str): Strong, unquoted ETag of the resource
+        build (callable): Returns the full Response
+    """
+
+    if_none_match = request.if_none_match
+    matched = None
+    if if_none_match.star_tag:
+        matched = etag
+    else:
+        for suffix in ETAG_ENCODING_SUFFIXES:
+            if if_none_match.contains_weak(etag + suffix):
+                matched = etag + suffix
+                break
+
+    if matched is not None:
+        response = current_app.response_class(status=304)
+        response.set_etag(matched)
+    else:
+        response = build()
+        response.set_etag(etag)
+
+    response.headers["Cache-Control"] = current_app.config["COURSE_CACHE_CONTROL"]
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def conditional_json(etag: str, build):
+    """
+    conditional_response() for a JSON body; build() returns the
+    JSON-serializable body.
+    """
+
+    return conditional_response(etag, lambda: jsonify(build()))
+
+
+def preferred_packing() -> str:
+    """
+    MSGPACK_MIMETYPE if the client prefers it (and msgpack is installed),
+    JSON_MIMETYPE otherwise.
+    """
+
+    if msgpack is None:
+        return JSON_MIMETYPE
+    best = request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE])
+    return best or JSON_MIMETYPE
+
+
+def pack(payload, mimetype: str) -> bytes:
+    if mimetype == MSGPACK_MIMETYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def init_serving(app: Flask):
+    app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+    app.config.setdefault("COMPRESS_LEVEL", 6)
+    app.config.setdefault("COMPRESS_BR_LEVEL", 5)
+
+    # Browsers reuse course data for a minute, then revalidate with the ETag;
+    # shared caches (CDN) may serve it stale while revalidating.
+    app.config.setdefault(
+        "COURSE_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=300"
+    )
+
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
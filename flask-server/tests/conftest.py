@@ -0,0 +1,105 @@
+import pytest
+
+from controllers.term_store import TermCatalog
+
+TERM = "2025/spring"
+
+
+class StubAPI:
+    """
+    Stands in for SFUCoursesAPI, answering get_section_info() from a dict
+    keyed by (dept, course, section) and get_course_outlines() with
+    outlines.
+    """
+
+    def __init__(self, sections: dict, outlines: dict = None):
+        self.sections = sections
+        self.outlines = outlines or {}
+        self.failed_departments = set()
+        self.failures = {}
+        self.request_count = 0
+
+    def get_course_outlines(self) -> dict:
+        return self.outlines
+
+    def get_section_info(self, dept, course, section):
+        return self.sections.get((dept, course, section), {})
+
+
+@pytest.fixture
+def section_info():
+    """
+    Factory for a get_section_info() response of the course outlines API.
+    """
+
+    def build(
+        title="Data Structures",
+        days="Mo, We",
+        start="10:30",
+        end="11:20",
+        capacity=120,
+        total=90,
+        campus="Burnaby",
+    ) -> dict:
+        return {
+            "title": title,
+            "units": "3",
+            "classType": "e",
+            "enrollmentCapacity": capacity,
+            "enrollmentTotal": total,
+            "instructor": [{"name": "A. Instructor"}],
+            "meetingTimes": [
+                {"days": days, "startTime": start, "endTime": end, "campus": campus}
+            ],
+        }
+
+    return build
+
+
+@pytest.fixture
+def make_catalog(section_info):
+    """
+    Factory for a TermCatalog holding TERM, built from a dict mapping
+    "DEPT/COURSE/SECTION" keys to section_info() responses. Defaults to
+    one section each of CMPT 225 and MATH 151.
+    """
+
+    def build(sections: dict = None) -> TermCatalog:
+        if sections is None:
+            sections = {
+                "CMPT/225/D100": section_info(),
+                "MATH/151/D100": section_info("Calculus"),
+            }
+        catalog = TermCatalog()
+        catalog.load_term(TERM, {})
+        for key, info in sections.items():
+            dept, course, section = key.split("/")
+            catalog.add_section_info(TERM, dept, course, section, info)
+        return catalog
+
+    return build
+
+
+@pytest.fixture
+def make_client(tmp_path, make_catalog):
+    """
+    Factory for a test client of an app with make_catalog()'s term
+    preloaded from a snapshot in a temporary TERM_DATA_DIR, taking extra
+    Flask config values.
+    """
+
+    from server import create_app
+
+    def build(config: dict = None):
+        make_catalog().save_term_file(TERM, str(tmp_path))
+        app = create_app(
+            dict(config or {}, TERM_DATA_DIR=str(tmp_path), PRELOAD_TERMS=[TERM])
+        )
+        return app.test_client()
+
+    return build
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
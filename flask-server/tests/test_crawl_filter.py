@@ -0,0 +1,69 @@
+from controllers import sfu_course_controller
+from controllers.crawl_filter import CrawlFilter
+
+
+def course(text, title="Course"):
+    return {"text": text, "title": title}
+
+
+def test_level_uses_leading_digits():
+    crawl_filter = CrawlFilter(min_level=100, max_level=499)
+
+    assert crawl_filter.keep_course(course("105W"))
+    assert crawl_filter.keep_course(course("499"))
+    assert not crawl_filter.keep_course(course("500"))
+    assert not crawl_filter.keep_course(course("XX1"))
+
+
+def test_course_without_digits_is_kept():
+    assert CrawlFilter(min_level=100).keep_course(course("XXX"))
+
+
+def test_default_rules():
+    crawl_filter = CrawlFilter.default()
+
+    assert crawl_filter.keep_department("cmpt")
+    assert not crawl_filter.keep_department("GRAD")
+    assert crawl_filter.keep_course(course("105W"))
+    assert not crawl_filter.keep_course(course("898"))
+    assert not crawl_filter.keep_course(course("415", "Engineering Practicum"))
+    assert crawl_filter.report()["courses_excluded"] == 2
+
+
+def test_allow_lists():
+    crawl_filter = CrawlFilter.from_dict(
+        {"allow_departments": ["CMPT"], "allow_components": ["lec"]}
+    )
+
+    assert crawl_filter.keep_department("CMPT")
+    assert not crawl_filter.keep_department("MATH")
+    assert crawl_filter.keep_section({"text": "D100", "sectionCode": "LEC"})
+    assert not crawl_filter.keep_section({"text": "D101", "sectionCode": "TUT"})
+    assert not crawl_filter.keep_section({"text": "D102"})
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+def test_course_controller_counts_each_crawl(monkeypatch):
+    def get(url):
+        if url.endswith("/cmpt"):
+            return FakeResponse([course("225"), course("898")])
+        return FakeResponse([{"text": "cmpt"}])
+
+    monkeypatch.setattr(sfu_course_controller.requests, "get", get)
+
+    for _ in range(2):
+        courses = sfu_course_controller.get_sfu_courses("2025/spring")
+
+    assert [c["text"] for c in courses["cmpt"]] == ["225"]
+    report = sfu_course_controller.CRAWL_FILTER.report()
+    assert report["courses_kept"] == report["courses_excluded"] == 1
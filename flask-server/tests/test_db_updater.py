@@ -0,0 +1,91 @@
+from benchmarks.fixture import FakeSupabase
+from controllers.db_updater import SupabaseInserter, same_row
+from tests.conftest import TERM, StubAPI
+
+
+def sync(client, info, failed=(), catalog=None):
+    api = StubAPI({("CMPT", "225", "d100"): info})
+    api.failed_departments = set(failed)
+    inserter = SupabaseInserter(
+        client, {"CMPT": {"225": ["d100"]}}, TERM, api=api, catalog=catalog
+    )
+    inserter.fetch_and_sync_all()
+    return inserter
+
+
+def test_resync_writes_nothing(section_info):
+    client = FakeSupabase()
+    sync(client, section_info())
+    client.rows_written.clear()
+
+    inserter = sync(client, section_info())
+
+    assert inserter.rows_changed == 0
+    assert not client.rows_written
+
+
+def test_changed_rows_are_updated(section_info):
+    client = FakeSupabase()
+    sync(client, section_info())
+
+    inserter = sync(client, section_info(title="Data Structures II", total=95))
+
+    assert inserter.stats["courses_updated"] == 1
+    assert inserter.stats["sections_updated"] == 1
+    assert not inserter.stats["sections_inserted"]
+    (section,) = client.tables["sections"]
+    assert section["enrollment_total"] == 95
+    assert client.tables["courses"][0]["title"] == "Data Structures II"
+
+
+def test_failed_department_is_left_alone(section_info):
+    client = FakeSupabase()
+    sync(client, section_info())
+
+    inserter = SupabaseInserter(client, {}, api=StubAPI({}))
+    inserter.api.failed_departments = {"CMPT"}
+    inserter.fetch_and_sync_all()
+
+    assert inserter.rows_changed == 0
+    assert client.tables["departments"] == [{"dept_code": "CMPT", "id": 1}]
+
+
+def test_same_row_compares_numbers_as_strings():
+    assert same_row({"id": 1, "total": 90}, {"total": "90"})
+    assert not same_row({"id": 1, "total": None}, {"total": "90"})
+    assert not same_row({"id": 1, "total": 90}, {"total": "91"})
+
+
+def test_synced_department_replaces_catalog_data(make_catalog, section_info):
+    catalog = make_catalog(
+        {
+            "CMPT/120/D100": section_info("Intro"),
+            "MATH/151/D100": section_info("Calculus"),
+        }
+    )
+
+    sync(FakeSupabase(), section_info(total=100), catalog=catalog)
+
+    term = catalog.get_term(TERM)
+    assert list(term.departments["CMPT"]) == ["225"]
+    assert term.get_section("CMPT", "225", "D100").enrollment_total == 100
+    # MATH is no longer listed, so it is gone from the catalog too
+    assert "MATH" not in term.departments
+
+
+def test_stale_department_rows_are_deleted(section_info):
+    client = FakeSupabase()
+    sync(client, section_info())
+    client.tables["departments"].append({"dept_code": "MATH", "id": 99})
+    client.tables["courses"].append({"dept_code": "MATH", "id": 100})
+    client.tables["sections"].append({"dept_code": "MATH", "id": 101})
+
+    inserter = sync(client, section_info())
+
+    assert inserter.stats == {
+        "departments_deleted": 1,
+        "courses_deleted": 1,
+        "sections_deleted": 1,
+    }
+    for table in ("departments", "courses", "sections", "instructors", "schedules"):
+        assert {row["dept_code"] for row in client.tables[table]} == {"CMPT"}
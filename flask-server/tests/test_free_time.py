@@ -0,0 +1,152 @@
+import pytest
+
+from controllers.free_time import (
+    SLOTS_PER_DAY,
+    SectionIndex,
+    neighbour_mask,
+    occupied_mask,
+    parse_search_request,
+    time_mask,
+)
+from tests.conftest import TERM
+
+
+@pytest.fixture
+def make_term(make_catalog):
+    def build(sections: dict):
+        return make_catalog(sections).get_term(TERM)
+
+    return build
+
+
+def test_time_mask_slots():
+    mask = time_mask("Mo", "10:30", "11:20")
+    # 10:30 is slot 63, 11:20 ends before slot 68
+    assert mask == ((1 << 5) - 1) << 63
+
+
+def test_time_mask_days():
+    monday = time_mask("Mo", "08:30", "09:20")
+    assert time_mask("Mo, We", "08:30", "09:20") == monday | (
+        monday << (2 * SLOTS_PER_DAY)
+    )
+
+
+def test_time_mask_partial_slot_rounds_up():
+    assert time_mask("Mo", "10:30", "11:25") == time_mask("Mo", "10:30", "11:30")
+
+
+def test_time_mask_missing_time():
+    assert time_mask("Mo", None, "11:20") == 0
+    assert time_mask("Mo", "11:20", "11:20") == 0
+
+
+def test_passing_period_is_adjacent():
+    occupied = time_mask("Mo", "10:30", "11:20")
+    neighbours = neighbour_mask(occupied)
+
+    assert time_mask("Mo", "11:30", "12:20") & neighbours
+    assert time_mask("Mo", "09:30", "10:20") & neighbours
+    assert not time_mask("Mo", "11:40", "12:20") & neighbours
+    assert not time_mask("Tu", "11:30", "12:20") & neighbours
+
+
+def test_neighbours_do_not_cross_days():
+    occupied = time_mask("Mo", "23:00", "24:00")
+    assert not neighbour_mask(occupied) & time_mask("Tu", "00:00", "00:30")
+
+
+def test_search_ranks_adjacent_sections_first(make_term, section_info):
+    term = make_term(
+        {
+            "CMPT/225/D100": section_info(days="Mo", start="10:30", end="11:20"),
+            "CMPT/276/D100": section_info(days="Mo", start="11:30", end="12:20"),
+            "MATH/151/D100": section_info(days="Mo", start="14:30", end="15:20"),
+            "MATH/152/D100": section_info(days="Mo", start="11:00", end="11:50"),
+        }
+    )
+    index = SectionIndex(term)
+    occupied = occupied_mask(term, sections=["CMPT/225/D100"])
+
+    result = index.search(occupied)
+
+    sections = [r["section"] for r in result["results"]]
+    # MATH 152 overlaps, CMPT 276 follows after the passing period
+    assert sections == ["CMPT/276/D100", "MATH/151/D100"]
+    assert result["results"][0]["adjacent_slots"] > 0
+
+
+def test_search_filters(make_term, section_info):
+    term = make_term(
+        {
+            "CMPT/276/D100": section_info(days="Mo", start="11:30", end="12:20"),
+            "MATH/151/D100": section_info(days="Tu", start="14:30", end="15:20"),
+        }
+    )
+    index = SectionIndex(term)
+
+    result = index.search(0, departments=["math"])
+
+    assert [r["section"] for r in result["results"]] == ["MATH/151/D100"]
+    assert index.search(0, campus="surrey")["count"] == 0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        [],
+        {"limit": "abc"},
+        {"busy": "x"},
+        {"busy": [{"days": "Mo", "start": "9", "end": "10:xx"}]},
+        {"busy": [{"days": "Xy", "start": "9", "end": "10"}]},
+        {"filters": {"departments": "CMPT"}},
+        {"busy": [{"days": "Mo", "start": "10:99", "end": "11:20"}]},
+        {"busy": [{"days": "Mo", "start": "24:30", "end": "24:40"}]},
+        {"busy": [{"days": "Mo", "start": "11:20", "end": "10:30"}]},
+        {"sections": ["CMPT/225"]},
+        {"sections": ["CMPT/999/D100"]},
+    ],
+)
+def test_parse_search_request_rejects_malformed(make_term, body):
+    with pytest.raises(ValueError):
+        parse_search_request(make_term(None), body)
+
+
+def test_parse_search_request_clamps_limit(make_term):
+    term = make_term({})
+    assert parse_search_request(term, {"limit": -5})[1]["limit"] == 0
+    assert parse_search_request(term, {"limit": 10**6})[1]["limit"] == 1000
+
+
+def test_parse_search_request_accepts_midnight(make_term):
+    occupied, _ = parse_search_request(
+        make_term(None), {"busy": [{"days": "Mo", "start": "23:00", "end": "24:00"}]}
+    )
+    assert occupied == time_mask("Mo", "23:00", "24:00")
+
+
+def test_free_time_route_rejects_invalid_json(client):
+    response = client.post(
+        "/courses/2025/spring/free-time",
+        data="notjson",
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+
+
+def test_free_time_route_lists_unknown_sections(client):
+    response = client.post(
+        "/courses/2025/spring/free-time",
+        json={"sections": ["CMPT/225/D100", "CMPT/225"]},
+    )
+    assert response.status_code == 400
+    assert "CMPT/225" in response.json["error"]
+
+
+def test_free_time_route_searches_around_sections(client):
+    response = client.post(
+        "/courses/2025/spring/free-time", json={"sections": ["CMPT/225/D100"]}
+    )
+    assert response.status_code == 200
+    # MATH 151 meets at the same time as CMPT 225
+    assert response.json["count"] == 0
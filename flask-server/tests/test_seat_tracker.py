@@ -0,0 +1,72 @@
+import pytest
+
+from controllers.seat_tracker import SeatSeries, SeatTracker
+
+
+def test_series_only_stores_changes():
+    series = SeatSeries(max_points=10)
+
+    assert series.record(1, 120, 90)
+    assert not series.record(2, 120, 90)
+    assert series.record(3, 120, 91)
+
+    assert series.to_dict() == {
+        "times": [1, 3],
+        "capacity": [120, 120],
+        "total": [90, 91],
+    }
+    assert series.latest() == {"time": 3, "capacity": 120, "total": 91}
+
+
+def test_series_keeps_latest_points():
+    series = SeatSeries(max_points=3)
+    for total in range(5):
+        series.record(total, 120, total)
+
+    assert series.to_dict()["total"] == [2, 3, 4]
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = SeatTracker("2025/spring")
+    # No polling thread, the tests only exercise bookkeeping
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    return tracker
+
+
+def test_watchers_are_counted(tracker):
+    first = tracker.subscribe(["CMPT/225/D100", "MATH/151/D100"])
+    second = tracker.subscribe(["CMPT/225/D100"])
+    assert tracker.watched == {"CMPT/225/D100": 2, "MATH/151/D100": 1}
+
+    tracker.unsubscribe(first)
+    assert tracker.watched == {"CMPT/225/D100": 1}
+    assert tracker.listeners == {"CMPT/225/D100": {second}}
+
+    tracker.unsubscribe(second)
+    assert not tracker.watched and not tracker.listeners and not tracker.subscribers
+
+
+def test_changes_reach_subscribers(tracker):
+    events = tracker.subscribe(["CMPT/225/D100"])
+
+    assert tracker._record("CMPT/225/D100", 120, 90)
+    assert not tracker._record("CMPT/225/D100", 120, 90)
+    tracker._record("MATH/151/D100", 120, 10)
+
+    event = events.get_nowait()
+    assert event["section"] == "CMPT/225/D100" and event["total"] == 90
+    assert events.empty()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/seats/2025/winter/stream?sections=CMPT/225/D100",
+        "/seats/25/spring/CMPT/225/D100",
+        "/seats/2025/spring;x/CMPT/225/D100",
+    ],
+)
+def test_routes_reject_unknown_terms(client, url):
+    assert client.get(url).status_code == 404
+    assert not client.application.extensions["seat_trackers"]
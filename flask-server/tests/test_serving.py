@@ -0,0 +1,52 @@
+import pytest
+
+BASE = "/courses/2025/spring"
+
+
+@pytest.mark.parametrize("weak", ["", "W/"])
+def test_matching_etag_is_not_modified(client, weak):
+    response = client.get(BASE)
+    etag = response.headers["ETag"]
+
+    again = client.get(BASE, headers={"If-None-Match": weak + etag})
+
+    assert again.status_code == 304
+    assert not again.data
+    assert again.headers["ETag"] == etag
+
+
+def test_stale_etag_gets_full_response(client):
+    response = client.get(BASE, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.json == ["CMPT", "MATH"]
+
+
+def test_cache_control(client):
+    response = client.get(BASE)
+    assert response.headers["Cache-Control"] == (
+        "public, max-age=60, stale-while-revalidate=300"
+    )
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_gzip_response_etag_suffix(make_client):
+    client = make_client({"COMPRESS_MIN_SIZE": 0})
+    plain = client.get(BASE).headers["ETag"]
+
+    response = client.get(BASE, headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] == plain[:-1] + '-gzip"'
+
+    # The compressed representation's ETag revalidates too
+    again = client.get(
+        BASE,
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]},
+    )
+    assert again.status_code == 304
+    assert again.headers["ETag"] == response.headers["ETag"]
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get(BASE, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
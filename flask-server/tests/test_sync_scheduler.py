@@ -0,0 +1,134 @@
+import threading
+from datetime import date
+
+import pytest
+
+from benchmarks.fixture import FakeSupabase
+from controllers import sync_scheduler
+from controllers.sync_scheduler import SyncScheduler, term_phase
+from tests.conftest import TERM, StubAPI
+
+
+@pytest.fixture
+def stub_api(monkeypatch, section_info):
+    """
+    Makes SyncScheduler runs fetch from a StubAPI serving the returned
+    dict, which maps (dept, course, section) to section_info() responses.
+    Starts with CMPT 225 D100 and MATH 151 D100.
+    """
+
+    sections = {
+        ("CMPT", "225", "d100"): section_info(),
+        ("MATH", "151", "d100"): section_info("Calculus"),
+    }
+
+    def build(term):
+        outlines = {}
+        for dept, course, section in sections:
+            outlines.setdefault(dept, {}).setdefault(course, []).append(section)
+        return StubAPI(dict(sections), outlines)
+
+    monkeypatch.setattr(sync_scheduler, "SFUCoursesAPI", build)
+    return sections
+
+
+def test_sync_writes_served_snapshot(tmp_path, stub_api, section_info):
+    from server import create_app
+
+    scheduler = SyncScheduler(TERM, FakeSupabase(), data_dir=str(tmp_path))
+    first = scheduler.run_once()["version"]
+
+    stub_api[("CMPT", "225", "d100")] = section_info(total=100)
+    second = scheduler.run_once()["version"]
+    assert second != first
+
+    app = create_app({"TERM_DATA_DIR": str(tmp_path), "PRELOAD_TERMS": [TERM]})
+    client = app.test_client()
+    response = client.get("/courses/2025/spring/CMPT/225/D100")
+    assert response.json["enrollment_total"] == 100
+
+    # Clients on the first sync's bundle are sent a patch
+    bundle = client.get(f"/courses/2025/spring/bundle?since={first}")
+    assert bundle.json["base"] == first
+    assert bundle.json["version"] == second
+
+
+def test_runs_between_full_passes_sync_changed_departments(stub_api, section_info):
+    client = FakeSupabase()
+    scheduler = SyncScheduler(TERM, client, full_sync_every=2)
+    assert scheduler.run_once()["full_pass"]
+
+    # Listings unchanged for long enough; a new MATH section changes its listing
+    scheduler.last_changed = dict.fromkeys(scheduler.last_changed, 0)
+    stub_api[("CMPT", "225", "d100")] = section_info(total=100)
+    stub_api[("MATH", "151", "d200")] = section_info("Calculus")
+    metrics = scheduler.run_once()
+
+    assert not metrics["full_pass"]
+    assert metrics["departments_changed"] == ["MATH"]
+    assert metrics["departments_synced"] == 1
+    assert len(client.tables["sections"]) == 3
+    cmpt = [s for s in client.tables["sections"] if s["dept_code"] == "CMPT"]
+    assert cmpt[0]["enrollment_total"] == 90
+
+    # The next full pass picks up the CMPT change
+    assert scheduler.run_once()["full_pass"]
+    cmpt = [s for s in client.tables["sections"] if s["dept_code"] == "CMPT"]
+    assert cmpt[0]["enrollment_total"] == 100
+
+
+@pytest.mark.parametrize(
+    "today, phase",
+    [
+        (date(2025, 6, 17), "off"),
+        (date(2025, 6, 18), "enrolment"),
+        (date(2025, 9, 14), "enrolment"),
+        (date(2025, 9, 15), "in_term"),
+        (date(2025, 12, 29), "in_term"),
+        (date(2025, 12, 30), "off"),
+    ],
+)
+def test_term_phase_boundaries(today, phase):
+    # Fall 2025 starts on September 1st
+    assert term_phase("2025/Fall", today) == phase
+
+
+@pytest.mark.parametrize("term", ["2025/winter", "fall", "25/fall/x", ""])
+def test_invalid_term_is_rejected(term):
+    with pytest.raises(ValueError):
+        SyncScheduler(term, FakeSupabase())
+
+
+def test_runs_do_not_overlap(monkeypatch):
+    scheduler = SyncScheduler(TERM, FakeSupabase())
+    started, release = threading.Event(), threading.Event()
+
+    def slow_sync():
+        started.set()
+        release.wait(5)
+        return {}
+
+    monkeypatch.setattr(scheduler, "_sync", slow_sync)
+    thread = threading.Thread(target=scheduler.run_once)
+    thread.start()
+    started.wait(5)
+
+    assert scheduler.run_once() is None
+
+    release.set()
+    thread.join()
+    assert scheduler.run_once() == {}
+
+
+@pytest.mark.skipif(sync_scheduler.fcntl is None, reason="needs fcntl")
+def test_runs_do_not_overlap_across_processes(tmp_path, monkeypatch):
+    lock_path = str(tmp_path / "sync.lock")
+    scheduler = SyncScheduler(TERM, FakeSupabase(), lock_path=lock_path)
+    monkeypatch.setattr(scheduler, "_sync", lambda: {})
+
+    # Another process holding the lock
+    with open(lock_path, "w") as other:
+        sync_scheduler.fcntl.flock(other, sync_scheduler.fcntl.LOCK_EX)
+        assert scheduler.run_once() is None
+
+    assert scheduler.run_once() == {}
@@ -0,0 +1,69 @@
+from controllers.term_bundle import BundleHistory, load_term_history
+from tests.conftest import TERM
+
+
+def apply_patch(bundle: dict, patch: dict) -> dict:
+    assert patch["base"] == bundle["version"]
+    assert patch["strings_offset"] == len(bundle["strings"])
+    departments = dict(bundle["departments"], **patch["departments"])
+    for dept in patch["removed"]:
+        del departments[dept]
+    return {
+        "format": patch["format"],
+        "term": patch["term"],
+        "version": patch["version"],
+        "strings": bundle["strings"] + patch["strings"],
+        "departments": departments,
+    }
+
+
+def test_patch_applies_to_base(make_catalog, section_info):
+    catalog = make_catalog()
+    history = BundleHistory()
+    base = history.update(catalog.get_term(TERM))
+
+    catalog.add_section_info(TERM, "MATH", "151", "D100", section_info("Calculus II"))
+    head = history.update(catalog.get_term(TERM))
+
+    patch = head.patch_from(base)
+    assert list(patch["departments"]) == ["MATH"]
+    assert apply_patch(base.full(), patch) == head.full()
+
+
+def test_unchanged_term_reuses_latest(make_catalog):
+    catalog = make_catalog()
+    history = BundleHistory()
+    first = history.update(catalog.get_term(TERM))
+    assert history.update(catalog.get_term(TERM)) is first
+
+
+def test_history_survives_restart(tmp_path, make_catalog, section_info):
+    catalog = make_catalog()
+    base = load_term_history(catalog.get_term(TERM), str(tmp_path)).latest
+    base_full = base.full()
+
+    # A new snapshot loaded by a fresh process
+    catalog.add_section_info(TERM, "CMPT", "225", "D100", section_info(total=5))
+    history = load_term_history(catalog.get_term(TERM), str(tmp_path))
+    head = history.latest
+
+    old = history.get(base.version)
+    assert old is not None and not old.complete
+    patch = head.patch_from(old)
+    assert list(patch["departments"]) == ["CMPT"]
+    assert apply_patch(base_full, patch) == head.full()
+
+    # Restarting on the same snapshot serves a complete bundle again
+    again = load_term_history(catalog.get_term(TERM), str(tmp_path)).latest
+    assert again.complete and again.full() == head.full()
+
+
+def test_route_sends_empty_patch_to_current_clients(client):
+    bundle = client.get("/courses/2025/spring/bundle").json
+
+    response = client.get(f"/courses/2025/spring/bundle?since={bundle['version']}")
+
+    patch = response.json
+    assert patch["base"] == patch["version"] == bundle["version"]
+    assert not patch["departments"] and not patch["removed"] and not patch["strings"]
+    assert apply_patch(bundle, patch) == bundle
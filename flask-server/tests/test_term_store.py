@@ -0,0 +1,45 @@
+from controllers.term_store import TermCatalog, days_mask, minutes
+from tests.conftest import TERM
+
+
+def test_days_mask_and_minutes():
+    assert days_mask("Mo, We") == 0b101
+    assert days_mask(None) == 0
+    assert minutes("10:30") == 630
+    assert minutes(None) == -1
+
+
+def test_digest_only_changes_for_changed_department(make_catalog, section_info):
+    catalog = make_catalog()
+    term = catalog.get_term(TERM)
+    version, cmpt, math = term.version, term.digest("CMPT"), term.digest("MATH")
+
+    catalog.add_section_info(TERM, "CMPT", "225", "D100", section_info(total=91))
+
+    assert term.version != version
+    assert term.digest("CMPT") != cmpt
+    assert term.digest("MATH") == math
+
+
+def test_digest_is_stable_and_case_insensitive(make_catalog):
+    term = make_catalog().get_term(TERM)
+
+    assert term.digest("cmpt", "225", "d100") == term.digest("CMPT", "225", "D100")
+    assert make_catalog().get_term(TERM).version == term.version
+
+
+def test_digest_of_missing_path_is_not_cached(make_catalog):
+    term = make_catalog().get_term(TERM)
+
+    assert term.digest("NOPE") is None
+    assert term.digest("CMPT", "999") is None
+    assert ("NOPE", None, None) not in term._digests
+
+
+def test_snapshot_round_trip(tmp_path, make_catalog):
+    catalog = make_catalog()
+    path = catalog.save_term_file(TERM, str(tmp_path))
+
+    loaded = TermCatalog().load_term_file(path)
+
+    assert loaded.version == catalog.get_term(TERM).version
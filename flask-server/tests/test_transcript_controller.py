@@ -0,0 +1,44 @@
+from io import BytesIO
+
+import pytest
+
+from controllers.transcript_controller import parse_course_data
+
+
+def test_parse_graded_course():
+    (course,) = parse_course_data(
+        ["CMPT 225 Data Structures and Programming 3.00 3.00 A 12.00 B+ 180"]
+    ).values()
+
+    assert course["course_department"] == "CMPT"
+    assert course["course_name"] == "Data Structures and Programming"
+    assert course["grade"] == "A"
+    assert course["grade_points"] == 12.0
+    assert course["class_enrollment"] == 180
+
+
+def test_parse_course_without_grade():
+    (course,) = parse_course_data(
+        ["CMPT 276 Intro Software Engineering 3.00 0.00 0.00 - 120"]
+    ).values()
+
+    assert course["grade"] is None
+    assert course["class_average"] is None
+    assert course["class_enrollment"] == 120
+
+
+def test_unparseable_line_raises():
+    with pytest.raises((IndexError, ValueError)):
+        parse_course_data(["CMPT 225 Data"])
+
+
+def test_route_rejects_non_pdf_upload(client):
+    pytest.importorskip("pdfplumber")
+
+    response = client.post(
+        "/transcript",
+        data={"transcript": (BytesIO(b"not a pdf"), "transcript.pdf")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 400
+    assert response.json == {"error": "Could not parse the transcript"}
@@ -0,0 +1,8 @@
+# wsgi.py
+
+# WSGI entry point for production serving:
+#     gunicorn -c gunicorn.conf.py
+
+from server import create_app
+
+app = create_app()